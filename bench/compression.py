@@ -0,0 +1,144 @@
+"""
+Storage benchmark for the compressed resume and match-result columns.
+
+Writes the same synthetic resumes and LLM payloads into throwaway SQLite databases as plain
+TEXT/JSON, zstd, and zstd with a trained dictionary, then reports file size, insert throughput,
+single-resume read latency and a list query that does not touch the compressed columns. Every
+database also gets the application's full-text index over the resumes, so file sizes include it.
+
+    python bench/compression.py --resumes 5000 --out bench/results/compression.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import JSON, Column, Float, Integer, MetaData, String, Table, Text, create_engine, select, text
+
+from corpus import iter_resumes
+from run import import_app_module, summarize
+
+STRENGTHS = [
+    "Strong Python and SQL background", "Hands-on cloud deployment experience (AWS)", "Led a small team",
+    "Production experience with Docker and CI/CD", "Solid data modelling skills", "Relevant domain experience",
+]
+GAPS = [
+    "No Kubernetes experience", "Limited exposure to PostgreSQL", "Short tenure in last role",
+    "No formal leadership experience", "Frontend skills not demonstrated",
+]
+
+
+def match_payload(rng: random.Random, resume_id: int) -> dict:
+    return {
+        "resume_id": resume_id,
+        "match_score": round(rng.uniform(2, 9.5), 1),
+        "summary": (f"Candidate {resume_id} shows {rng.choice(['strong', 'moderate', 'partial'])} alignment with the role. "
+                    f"{rng.choice(STRENGTHS)}, but {rng.choice(GAPS).lower()}. Overall a {rng.choice(['low', 'medium'])} risk hire."),
+        "strengths": rng.sample(STRENGTHS, 3),
+        "gaps": rng.sample(GAPS, 2),
+    }
+
+
+def tables(text_type, json_type):
+    metadata = MetaData()
+    resumes = Table("resumes", metadata, Column("id", Integer, primary_key=True), Column("name", String),
+                    Column("skills", JSON), Column("raw_text", text_type))
+    matches = Table("match_results", metadata, Column("id", Integer, primary_key=True), Column("resume_id", Integer),
+                    Column("match_score", Float), Column("summary", text_type),
+                    Column("strengths", json_type), Column("gaps", json_type))
+    return metadata, resumes, matches
+
+
+def run_mode(mode: str, resume_rows, match_rows, reads: int, seed: int) -> dict:
+    compression = import_app_module("compression")
+    if mode == "plain":
+        metadata, resumes, matches = tables(Text, JSON)
+    else:
+        metadata, resumes, matches = tables(compression.CompressedText, compression.CompressedJSON)
+        dictionaries = {}
+        if mode == "zstd+dict":
+            samples = [r["raw_text"].encode() for r in resume_rows[:2000]] + [m["summary"].encode() for m in match_rows[:2000]]
+            dictionaries = {1: compression.train_dictionary(samples, 64 * 1024)}
+        compression.CODEC.set_dictionaries(dictionaries)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="screener-compression-"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for i in range(0, len(resume_rows), 500):
+            conn.execute(resumes.insert(), resume_rows[i:i + 500])
+    resume_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for i in range(0, len(match_rows), 500):
+            conn.execute(matches.insert(), match_rows[i:i + 500])
+    match_seconds = time.perf_counter() - started
+    search = import_app_module("search")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(search.SQLITE_TABLE_SQL)
+        conn.execute(text("INSERT INTO resume_search(rowid, name, skills, body) VALUES (:id, :name, '', :body)"),
+                     [{"id": r["id"], "name": r["name"], "body": r["raw_text"]} for r in resume_rows])
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+        search_bytes = conn.exec_driver_sql("SELECT sum(pgsize) FROM dbstat WHERE name LIKE 'resume_search%'").scalar()
+
+    rng = random.Random(seed)
+    read_samples, list_samples = [], []
+    with engine.connect() as conn:
+        for _ in range(reads):
+            resume_id = rng.randint(1, len(resume_rows))
+            start = time.perf_counter()
+            conn.execute(select(resumes.c.raw_text).where(resumes.c.id == resume_id)).scalar_one()
+            read_samples.append((time.perf_counter() - start) * 1000.0)
+        for _ in range(min(reads, 200)):
+            start = time.perf_counter()
+            conn.execute(select(resumes.c.id, resumes.c.name).order_by(resumes.c.id.desc()).limit(100)).all()
+            list_samples.append((time.perf_counter() - start) * 1000.0)
+    engine.dispose()
+
+    return {
+        "db_bytes": os.path.getsize(path),
+        "search_index_bytes": search_bytes,
+        "resume_inserts_per_s": round(len(resume_rows) / resume_seconds, 1),
+        "match_inserts_per_s": round(len(match_rows) / match_seconds, 1),
+        "read_one_resume": summarize(read_samples),
+        "list_100_resumes": summarize(list_samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--matches-per-resume", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write results JSON here (default: stdout only)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resume_rows = [
+        {"id": index + 1, "name": lines[0], "skills": [], "raw_text": "\n".join(lines)}
+        for index, lines in iter_resumes(args.resumes, args.seed)
+    ]
+    match_rows = [match_payload(rng, r["id"]) for r in resume_rows for _ in range(args.matches_per_resume)]
+
+    results = {mode: run_mode(mode, resume_rows, match_rows, args.reads, args.seed) for mode in ("plain", "zstd", "zstd+dict")}
+    print(json.dumps(results, indent=2))
+    plain = results["plain"]["db_bytes"]
+    for mode, row in results.items():
+        print(f"{mode:<10} {row['db_bytes'] / 1e6:8.2f} MB ({row['db_bytes'] / plain:6.1%})"
+              f"  resumes/s {row['resume_inserts_per_s']:>9}  read p50 {row['read_one_resume']['p50_ms']} ms",
+              file=sys.stderr)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
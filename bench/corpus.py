@@ -0,0 +1,62 @@
+"""
+Generates a reproducible synthetic corpus of resume PDFs and job descriptions.
+
+    python bench/corpus.py --resumes 100000 --jobs 500 --out bench/data/100k
+
+Layout: resumes/<shard>/resume_<n>.pdf (1,000 per shard), resumes.jsonl with the source
+text of every resume, and jobs.jsonl with POST /job-descriptions/ payloads. The same
+seed always yields byte-identical output.
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, Iterator, List, Tuple
+
+from synthetic import job_description, make_pdf, resume_lines
+
+SHARD_SIZE = 1000
+
+
+def iter_resumes(count: int, seed: int = 7) -> Iterator[Tuple[int, List[str]]]:
+    """Yields (index, text lines) lazily so 100k-resume corpora never sit in memory at once."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield index, resume_lines(rng, index, jobs=rng.randint(1, 8))
+
+
+def make_jobs(count: int, seed: int = 11) -> List[Dict]:
+    rng = random.Random(seed)
+    return [job_description(rng, index) for index in range(count)]
+
+
+def write_corpus(out_dir: str, resumes: int, jobs: int, seed: int, pdfs: bool = True):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "resumes.jsonl"), "w") as index_file:
+        for index, lines in iter_resumes(resumes, seed):
+            record = {"index": index, "filename": f"resume_{index:06d}.pdf", "text": "\n".join(lines)}
+            if pdfs:
+                shard = os.path.join(out_dir, "resumes", f"{index // SHARD_SIZE:03d}")
+                os.makedirs(shard, exist_ok=True)
+                with open(os.path.join(shard, record["filename"]), "wb") as f:
+                    f.write(make_pdf(lines))
+            index_file.write(json.dumps(record) + "\n")
+    with open(os.path.join(out_dir, "jobs.jsonl"), "w") as f:
+        for job in make_jobs(jobs, seed + 1):
+            f.write(json.dumps(job) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "data", "corpus"))
+    parser.add_argument("--no-pdf", action="store_true", help="Only write resumes.jsonl (much faster for large sizes)")
+    args = parser.parse_args()
+    write_corpus(args.out, args.resumes, args.jobs, args.seed, pdfs=not args.no_pdf)
+    print(f"Wrote {args.resumes} resumes and {args.jobs} jobs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Mixed-traffic load test against a running API.
+
+Drives concurrent list reads, PDF uploads and bulk matches, then reports per-endpoint
+latency percentiles. Run the server with the offline LLM for a network-free test:
+
+    LLM_PROVIDER=stub LLM_STUB_LATENCY_MS=300 uvicorn backend.main:app --workers 1
+    python bench/load_test.py --duration 60 --concurrency 32 --json load_report.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from synthetic import make_pdf, resume_lines
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+class LoadTest:
+    def __init__(self, base_url: str, concurrency: int, duration: float, mix: Dict[str, float], seed: int):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.resume_ids: List[int] = []
+        self.job_id = None
+
+    async def setup(self, client: httpx.AsyncClient):
+        response = await client.post("/job-descriptions/", json={
+            "title": "Load Test Backend Engineer",
+            "description": "Build Python microservices on AWS with Docker and PostgreSQL. 3+ years of experience.",
+            "required_skills": ["Python", "AWS", "Docker", "PostgreSQL"],
+            "required_experience": 3.0,
+        })
+        response.raise_for_status()
+        self.job_id = response.json()["id"]
+        for _ in range(4):
+            await self.upload(client)
+
+    async def timed(self, name: str, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+            if response.status_code >= 400:
+                self.errors[name] += 1
+            return response
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        finally:
+            self.latencies[name].append((time.perf_counter() - start) * 1000.0)
+
+    async def upload(self, client: httpx.AsyncClient):
+        index = self.rng.randint(0, 10 ** 9)
+        pdf = make_pdf(resume_lines(self.rng, index, jobs=self.rng.randint(2, 12)))
+        files = {"file": (f"loadtest_{uuid.uuid4().hex}.pdf", pdf, "application/pdf")}
+        response = await self.timed("upload-resume", client.post("/upload-resume/", files=files))
+        if response is not None and response.status_code == 200:
+            self.resume_ids.append(response.json()["id"])
+
+    async def list_resumes(self, client: httpx.AsyncClient):
+        await self.timed("resumes", client.get("/resumes/", params={"limit": 50}))
+
+    async def bulk_match(self, client: httpx.AsyncClient):
+        if not self.resume_ids:
+            return
+        ids = self.rng.sample(self.resume_ids, min(len(self.resume_ids), 20))
+        await self.timed("bulk-match", client.post("/bulk-match/", json={
+            "resume_ids": ids, "job_description_id": self.job_id
+        }))
+
+    async def worker(self, client: httpx.AsyncClient, deadline: float):
+        actions = {"resumes": self.list_resumes, "upload": self.upload, "bulk-match": self.bulk_match}
+        names, weights = zip(*self.mix.items())
+        while time.perf_counter() < deadline:
+            await actions[self.rng.choices(names, weights)[0]](client)
+
+    async def run(self) -> Dict:
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=300.0, limits=limits) as client:
+            await self.setup(client)
+            self.latencies.clear()
+            self.errors.clear()
+            started = time.perf_counter()
+            deadline = started + self.duration
+            await asyncio.gather(*(self.worker(client, deadline) for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - started
+
+        report = {"duration_s": round(elapsed, 2), "concurrency": self.concurrency, "endpoints": {}}
+        for name, samples in sorted(self.latencies.items()):
+            report["endpoints"][name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(percentile(samples, 50), 1),
+                "p95_ms": round(percentile(samples, 95), 1),
+                "p99_ms": round(percentile(samples, 99), 1),
+                "max_ms": round(max(samples), 1),
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of sustained traffic")
+    parser.add_argument("--mix", default="resumes=80,upload=15,bulk-match=5", help="Relative weight of each action")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    mix = {name: float(weight) for name, weight in (part.split("=") for part in args.mix.split(","))}
+    report = asyncio.run(LoadTest(args.base_url, args.concurrency, args.duration, mix, args.seed).run())
+
+    print(f"{'endpoint':<16}{'reqs':>8}{'errs':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, row in report["endpoints"].items():
+        print(f"{name:<16}{row['requests']:>8}{row['errors']:>6}{row['rps']:>9}"
+              f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
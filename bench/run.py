@@ -0,0 +1,207 @@
+"""
+Offline, CPU-only benchmark suite.
+
+Covers ResumeParser.parse_resume, extract_skills, MatchingEngine.bulk_match (with the stub
+LLM), resume-to-jobs ranking over the open-job matrix and the main API endpoints against a
+throwaway SQLite database. Results are written as JSON; pass --baseline to compare with an
+earlier run and fail on regressions.
+
+    python bench/run.py --size small --out bench/results/latest.json
+    python bench/run.py --size small --baseline bench/results/main.json --threshold 0.25
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from corpus import iter_resumes, make_jobs
+from synthetic import make_pdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = {
+    "small": {"resumes": 1000, "parse": 25, "match": 200, "open_jobs": 1000, "api_uploads": 10, "api_reads": 50},
+    "medium": {"resumes": 10000, "parse": 100, "match": 1000, "open_jobs": 5000, "api_uploads": 50, "api_reads": 200},
+    "large": {"resumes": 100000, "parse": 500, "match": 10000, "open_jobs": 20000, "api_uploads": 200, "api_reads": 1000},
+}
+
+
+def summarize(samples_ms: List[float], items: int = None) -> Dict:
+    ordered = sorted(samples_ms)
+    total_s = sum(ordered) / 1000.0
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))], 3)
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "total_s": round(total_s, 3),
+        "ops_per_s": round((items or len(ordered)) / total_s, 2) if total_s else None,
+    }
+
+
+def measure(fn: Callable, args_list: List, warmup: int = 2) -> List[float]:
+    for args in args_list[:warmup]:
+        fn(*args)
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def import_app_module(name: str):
+    """Imports a module of the application package (the repository directory itself)."""
+    sys.path.insert(0, os.path.dirname(ROOT))
+    package = os.getenv("SCREENER_PACKAGE", os.path.basename(ROOT))
+    return importlib.import_module(f"{package}.{name}")
+
+
+def run_benchmarks(size: str, seed: int, only: List[str]) -> Dict:
+    config = SIZES[size]
+    corpus = [lines for _, lines in iter_resumes(config["resumes"], seed)]
+    texts = ["\n".join(lines) for lines in corpus]
+    jobs = make_jobs(10, seed + 1)
+    results = {}
+
+    pdf_parser = import_app_module("pdf_parser")
+    parser = pdf_parser.ResumeParser()
+
+    if "parse" in only:
+        pdfs = [(make_pdf(lines), f"resume_{i}.pdf") for i, lines in enumerate(corpus[:config["parse"]])]
+        results["parse_resume"] = summarize(measure(parser.parse_resume_bytes, pdfs))
+
+    if "skills" in only:
+        results["extract_skills"] = summarize(measure(parser.extract_skills, [(t,) for t in texts]))
+
+    if "match" in only:
+        models = import_app_module("models")
+        matching_engine = import_app_module("matching_engine")
+        engine = matching_engine.MatchingEngine()
+        resumes = [
+            models.Resume(id=i + 1, name=f"Candidate {i}", skills=parser.extract_skills(text),
+                          experience=parser.extract_experience(text), raw_text=text, digest=None)
+            for i, text in enumerate(texts[:config["match"]])
+        ]
+        job = models.JobDescription(id=1, **jobs[0])
+        samples = measure(engine.bulk_match, [(resumes, job)] * 3, warmup=1)
+        results["bulk_match"] = summarize(samples, items=len(resumes) * len(samples))
+        samples = measure(lambda r, j: asyncio.run(engine.abulk_match(r, j)), [(resumes, job)] * 3, warmup=1)
+        results["abulk_match"] = summarize(samples, items=len(resumes) * len(samples))
+
+        # Reverse matching: one resume against every open job, as on upload
+        job_index = import_app_module("job_index")
+        open_jobs = [(i + 1, job["required_skills"], job["required_experience"]) for i, job in enumerate(make_jobs(config["open_jobs"], seed + 2))]
+        matrix = job_index.JobMatrix(open_jobs)
+        results["reverse_top_jobs"] = summarize(measure(matrix.top_jobs, [(r, 10) for r in resumes]))
+
+    if "api" in only:
+        results.update(run_api_benchmarks(config, corpus, jobs))
+
+    return results
+
+
+def run_api_benchmarks(config: Dict, corpus: List[List[str]], jobs: List[Dict]) -> Dict:
+    from fastapi.testclient import TestClient
+
+    main = import_app_module("main")
+    results = {}
+    with TestClient(main.app) as client:
+        job_id = client.post("/job-descriptions/", json=jobs[0]).json()["id"]
+
+        uploads = [(make_pdf(lines), i) for i, lines in enumerate(corpus[:config["api_uploads"]])]
+        resume_ids = []
+
+        def upload(pdf: bytes, i: int):
+            response = client.post("/upload-resume/", files={"file": (f"bench_{i}.pdf", pdf, "application/pdf")})
+            response.raise_for_status()
+            resume_ids.append(response.json()["id"])
+
+        results["api_upload_resume"] = summarize(measure(upload, uploads, warmup=0))
+        results["api_list_resumes"] = summarize(measure(
+            lambda: client.get("/resumes/", params={"limit": 100}).raise_for_status(), [()] * config["api_reads"]))
+        results["api_bulk_match"] = summarize(measure(
+            lambda: client.post("/bulk-match/", json={"resume_ids": resume_ids, "job_description_id": job_id}).raise_for_status(),
+            [()] * 10))
+        results["api_list_match_results"] = summarize(measure(
+            lambda: client.get("/match-results/", params={"job_id": job_id}).raise_for_status(), [()] * config["api_reads"]))
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Prints a comparison table and returns the names of regressed benchmarks (p50-based)."""
+    regressions = []
+    print(f"\n{'benchmark':<26}{'baseline p50':>14}{'current p50':>14}{'change':>10}")
+    for name, row in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or not base.get("p50_ms"):
+            print(f"{name:<26}{'-':>14}{row['p50_ms']:>14}{'new':>10}")
+            continue
+        change = row["p50_ms"] / base["p50_ms"] - 1.0
+        flag = " REGRESSION" if change > threshold else ""
+        print(f"{name:<26}{base['p50_ms']:>14}{row['p50_ms']:>14}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=SIZES, default="small")
+    parser.add_argument("--only", default="parse,skills,match,api", help="Comma-separated subset to run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Write results JSON here (default: stdout only)")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    # Everything runs offline: stub LLM, in-process parsing, throwaway database
+    workdir = tempfile.mkdtemp(prefix="screener-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ.setdefault("PARSER_WORKERS", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    random.seed(args.seed)
+
+    results = {
+        "meta": {
+            "size": args.size,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "benchmarks": run_benchmarks(args.size, args.seed, args.only.split(",")),
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
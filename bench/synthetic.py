@@ -0,0 +1,106 @@
+"""Synthetic resume text and a dependency-free PDF writer for offline benchmarks and load tests."""
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ["Aarav", "Priya", "Liam", "Sofia", "Chen", "Fatima", "Mateo", "Anjali", "Noah", "Yuki", "Omar", "Elena"]
+LAST_NAMES = ["Sharma", "Rao", "Smith", "Garcia", "Wang", "Khan", "Rossi", "Patel", "Kim", "Novak", "Silva", "Okafor"]
+TITLES = ["Software Engineer", "Backend Developer", "Data Scientist", "Frontend Developer", "DevOps Engineer", "ML Engineer"]
+COMPANIES = ["CloudNet", "Data Insights Co.", "Acme Corp", "Bluewave Labs", "Nimbus Systems", "Orbit Analytics"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "React", "Angular", "Django", "Flask", "Node.js",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "AWS", "Azure", "Docker", "Kubernetes", "Terraform", "Jenkins",
+    "Machine Learning", "TensorFlow", "PyTorch", "Scikit-learn", "NLP", "Git", "Linux", "Agile", "Leadership"
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+ACHIEVEMENTS = [
+    "Built and deployed {a} services handling millions of requests per day.",
+    "Migrated legacy systems to {a} and {b}, cutting infrastructure cost by {n}%.",
+    "Led a team of {m} engineers delivering {a} features on an agile cadence.",
+    "Improved {a} pipeline throughput by {n}% through profiling and caching.",
+    "Designed REST APIs with {a} backed by {b} for internal analytics tooling.",
+]
+
+
+def resume_lines(rng: random.Random, index: int, jobs: int = 3) -> List[str]:
+    """Returns the text lines of one plausible resume; `index` keeps names and emails unique."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines = [
+        f"{first} {last}",
+        rng.choice(TITLES),
+        f"{first.lower()}.{last.lower()}.{index}@example.com | +1 415 555 {index % 10000:04d}",
+        "",
+        "Summary",
+        f"Engineer with {rng.randint(1, 12)} years of experience in {', '.join(skills[:3])}.",
+        "",
+        "Professional Experience",
+    ]
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {year})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append("- " + rng.choice(ACHIEVEMENTS).format(
+                a=rng.choice(skills), b=rng.choice(skills), n=rng.randint(10, 60), m=rng.randint(2, 9)))
+        year = start
+    lines += [
+        "",
+        "Education",
+        f"Bachelor of Technology in Computer Science - State University ({year - 4} - {year})",
+        "",
+        "Skills",
+        ", ".join(skills),
+    ]
+    return lines
+
+
+def job_description(rng: random.Random, index: int) -> Dict:
+    """Returns one job description payload in the shape accepted by POST /job-descriptions/."""
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(3, 7))
+    years = rng.choice([0.5, 1.0, 2.0, 3.0, 5.0, 8.0])
+    duties = [rng.choice(ACHIEVEMENTS).format(a=rng.choice(skills), b=rng.choice(skills), n=rng.randint(10, 60), m=rng.randint(2, 9))
+              for _ in range(rng.randint(3, 6))]
+    return {
+        "title": f"{title} #{index}",
+        "description": (f"We are hiring a {title} to join our platform team. You will work with {', '.join(skills)}. "
+                        f"Requires {years:g}+ years of experience. Responsibilities: " + " ".join(duties)),
+        "required_skills": skills,
+        "required_experience": years,
+        "required_education": "Bachelor's Degree",
+    }
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Writes a minimal, valid multi-page PDF with one Helvetica text line per entry."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        content = "BT\n/F1 11 Tf\n14 TL\n50 750 Td\n" + "".join(f"({_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        stream = content.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
\ No newline at end of file
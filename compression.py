@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import threading
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import LargeBinary, inspect, text
+from sqlalchemy.types import TypeDecorator
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # zlib keeps working without it, at a worse ratio
+    zstandard = None
+
+# Stored values start with MAGIC (never a valid first byte of UTF-8 text), then a codec byte;
+# CODEC_ZSTD_DICT is followed by the 4-byte id of the dictionary in compression_dictionaries.
+MAGIC = 0xFF
+CODEC_ZLIB, CODEC_ZSTD, CODEC_ZSTD_DICT = 1, 2, 3
+
+
+class StorageCodec:
+    """
+    Compresses column values for storage. Values shorter than COMPRESSION_MIN_BYTES are kept as
+    plain UTF-8, and anything without the header (legacy TEXT/JSON rows) is read back as-is.
+    """
+
+    def __init__(self):
+        self.level = int(os.getenv("COMPRESSION_LEVEL", 3))
+        self.min_bytes = int(os.getenv("COMPRESSION_MIN_BYTES", 64))
+        self.active_dict_id: Optional[int] = None
+        self._dictionaries: Dict[int, object] = {}
+        self._loader: Optional[Callable[[], Dict[int, bytes]]] = None
+        self._local = threading.local()  # zstd (de)compressors are not thread-safe
+
+    def set_dictionaries(self, dictionaries: Dict[int, bytes], loader: Optional[Callable[[], Dict[int, bytes]]] = None):
+        """Registers trained dictionaries; the newest one is used for new writes."""
+        if zstandard is None:
+            return
+        self._dictionaries = {
+            dict_id: zstandard.ZstdCompressionDict(data) for dict_id, data in dictionaries.items()
+        }
+        self.active_dict_id = max(self._dictionaries) if self._dictionaries else None
+        self._loader = loader or self._loader
+        self._local = threading.local()
+
+    def _dictionary(self, dict_id: int):
+        if dict_id not in self._dictionaries and self._loader:
+            # Trained by another process after this one loaded its dictionaries
+            self.set_dictionaries(self._loader())
+        if dict_id not in self._dictionaries:
+            raise ValueError(f"Compression dictionary {dict_id} is not available.")
+        return self._dictionaries[dict_id]
+
+    def _compressor(self, dict_id: Optional[int]):
+        cache = self._local.__dict__.setdefault("compressors", {})
+        if dict_id not in cache:
+            dict_data = self._dictionary(dict_id) if dict_id is not None else None
+            cache[dict_id] = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+        return cache[dict_id]
+
+    def _decompressor(self, dict_id: Optional[int]):
+        cache = self._local.__dict__.setdefault("decompressors", {})
+        if dict_id not in cache:
+            dict_data = self._dictionary(dict_id) if dict_id is not None else None
+            cache[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return cache[dict_id]
+
+    def header(self) -> bytes:
+        """Prefix of every value compress() writes now (above min_bytes)."""
+        if zstandard is None:
+            return bytes((MAGIC, CODEC_ZLIB))
+        if self.active_dict_id is not None:
+            return bytes((MAGIC, CODEC_ZSTD_DICT)) + self.active_dict_id.to_bytes(4, "big")
+        return bytes((MAGIC, CODEC_ZSTD))
+
+    def compress(self, data: bytes) -> bytes:
+        if len(data) < self.min_bytes:
+            return data
+        if zstandard is None:
+            return self.header() + zlib.compress(data, 6)
+        return self.header() + self._compressor(self.active_dict_id).compress(data)
+
+    def decompress(self, value) -> str:
+        if isinstance(value, str):
+            return value
+        value = bytes(value)
+        if not value or value[0] != MAGIC:
+            return value.decode("utf-8")
+        codec = value[1]
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(value[2:]).decode("utf-8")
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed data requires the 'zstandard' package.")
+        if codec == CODEC_ZSTD:
+            return self._decompressor(None).decompress(value[2:]).decode("utf-8")
+        if codec == CODEC_ZSTD_DICT:
+            return self._decompressor(int.from_bytes(value[2:6], "big")).decompress(value[6:]).decode("utf-8")
+        raise ValueError(f"Unknown storage codec {codec}.")
+
+    def stale_clause(self, column: str, dialect_name: str) -> str:
+        """
+        SQL condition for values not in the format compress() writes now: legacy text, another codec or
+        dictionary, or plain bytes at or above min_bytes. Takes the stale_params() parameters.
+        """
+        current = (f"substr({column}, 1, length(:header)) = :header"
+                   f" OR (length({column}) < :min_bytes AND substr({column}, 1, 1) <> :magic)")
+        if dialect_name == "sqlite":  # Legacy values are TEXT there; PostgreSQL columns are BYTEA by now
+            current = f"typeof({column}) = 'blob' AND ({current})"
+        return f"{column} IS NOT NULL AND NOT ({current})"
+
+    def stale_params(self) -> Dict:
+        return {"header": self.header(), "magic": bytes((MAGIC,)), "min_bytes": self.min_bytes}
+
+
+CODEC = StorageCodec()
+
+
+class CompressedText(TypeDecorator):
+    """Text stored compressed as bytes; legacy uncompressed values read back unchanged."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else CODEC.compress(value.encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else CODEC.decompress(value)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON stored compressed as bytes; legacy JSON text reads back unchanged."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else CODEC.compress(json.dumps(value).encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else json.loads(CODEC.decompress(value))
+
+
+def train_dictionary(samples: List[bytes], size: int) -> Optional[bytes]:
+    if zstandard is None:
+        return None
+    try:
+        return zstandard.train_dictionary(size, samples, level=CODEC.level).as_bytes()
+    except zstandard.ZstdError as e:
+        logger.warning(f"Could not train a compression dictionary: {e}")
+        return None
+
+
+def _compressed_columns():
+    from .models import Resume, MatchResult
+
+    return [(model.__table__, column) for model in (Resume, MatchResult)
+            for column in model.__table__.columns if isinstance(column.type, (CompressedText, CompressedJSON))]
+
+
+def load_dictionaries(engine) -> Dict[int, bytes]:
+    from .models import CompressionDictionary
+
+    with engine.connect() as conn:
+        return {row.id: row.data for row in conn.execute(CompressionDictionary.__table__.select())}
+
+
+def migrate_storage(engine, batch_size: int = 1000):
+    """
+    Brings existing rows onto compressed storage: converts PostgreSQL TEXT/JSON columns to BYTEA,
+    trains a dictionary if there is none yet and COMPRESSION_DICT_MIN_SAMPLES values exist (startup is
+    the only time one is trained), and rewrites every value
+    that is not in the current format.
+    """
+    from .models import CompressionDictionary
+
+    columns = _compressed_columns()
+    if engine.dialect.name == "postgresql":
+        inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table, column in columns:
+                current = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+                if not isinstance(current[column.name], LargeBinary):
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE BYTEA"
+                        f" USING convert_to({column.name}::text, 'UTF8')"
+                    ))
+                    logger.info(f"Converted '{table.name}.{column.name}' to BYTEA.")
+
+    loader = lambda: load_dictionaries(engine)
+    CODEC.set_dictionaries(loader(), loader)
+    if CODEC.active_dict_id is None and zstandard is not None:
+        samples = []
+        with engine.connect() as conn:
+            for table, column in columns:
+                rows = conn.execute(text(
+                    f"SELECT {column.name} FROM {table.name} WHERE {column.name} IS NOT NULL ORDER BY id DESC LIMIT 2000"
+                ))
+                samples.extend(CODEC.decompress(row[0]).encode("utf-8") for row in rows)
+        if len(samples) >= int(os.getenv("COMPRESSION_DICT_MIN_SAMPLES", 500)):
+            data = train_dictionary(samples, int(os.getenv("COMPRESSION_DICT_BYTES", 64 * 1024)))
+            if data:
+                with engine.begin() as conn:
+                    conn.execute(CompressionDictionary.__table__.insert().values(data=data))
+                CODEC.set_dictionaries(loader(), loader)
+                logger.info(f"Trained a {len(data)}-byte compression dictionary from {len(samples)} samples.")
+
+    # Only rows not yet in the current format are read, so once migrated this is a single filtered scan
+    for table, column in columns:
+        rewritten, last_id = 0, 0
+        stale_clause = CODEC.stale_clause(column.name, engine.dialect.name)
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(text(
+                    f"SELECT id, {column.name} FROM {table.name} WHERE id > :after AND {stale_clause} ORDER BY id LIMIT :limit"
+                ), {"after": last_id, "limit": batch_size, **CODEC.stale_params()}).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                conn.execute(
+                    text(f"UPDATE {table.name} SET {column.name} = :value WHERE id = :row_id"),
+                    [{"row_id": row[0], "value": CODEC.compress(CODEC.decompress(row[1]).encode("utf-8"))} for row in rows]
+                )
+                rewritten += len(rows)
+        if rewritten:
+            logger.info(f"Compressed {rewritten} existing values of '{table.name}.{column.name}'.")
\ No newline at end of file
@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+import logging
+from sqlalchemy import create_engine, event, inspect, select, text, update
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 import os
-from .models import Base
+from .models import Base, DataVersion
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_screener_v2.db")
 
@@ -11,6 +15,25 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _to_async_url(url: str) -> str:
+    """Maps a sync database URL onto its asyncio driver."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _to_async_url(DATABASE_URL))
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        # WAL lets readers keep going while an upload or match batch is being written
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
 def get_db():
     """Dependency to get a DB session for each request."""
     db = SessionLocal()
@@ -19,8 +42,59 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Async dependency yielding an AsyncSession for each request."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def read_version(db: AsyncSession, name: str) -> int:
+    """Current value of a data_versions counter (0 if it was never bumped)."""
+    return await db.scalar(select(DataVersion.version).where(DataVersion.name == name)) or 0
+
+async def bump_version(db: AsyncSession, name: str):
+    """Increments a data_versions counter; call in the same transaction as the change it announces."""
+    result = await db.execute(update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1))
+    if not result.rowcount:
+        db.add(DataVersion(name=name, version=1))
+
 def create_tables():
     """Creates all database tables defined in models.py."""
-    print("Initializing database and creating tables if they don't exist...")
+    logger.info("Initializing database and creating tables if they don't exist...")
     Base.metadata.create_all(bind=engine)
-    print("Database tables are ready.")
\ No newline at end of file
+    add_missing_columns()
+    sync_indexes()
+    logger.info("Database tables are ready.")
+
+def add_missing_columns():
+    """Adds columns introduced after a table was first created (create_all never alters existing tables)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                default = ""
+                if column.server_default is not None:
+                    # Existing rows pick up the default instead of NULL
+                    default = f" DEFAULT {column.server_default.arg.compile(dialect=engine.dialect)}"
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}'))
+                logger.info(f"Added column '{table.name}.{column.name}'.")
+
+def sync_indexes():
+    """Creates indexes missing from existing tables and rebuilds those whose uniqueness changed."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {ix["name"]: ix for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                current = existing.get(index.name)
+                if current is not None and bool(current["unique"]) == bool(index.unique):
+                    continue
+                if current is not None:
+                    index.drop(conn)
+                index.create(conn)
+                logger.info(f"Rebuilt index '{index.name}'." if current is not None else f"Created index '{index.name}'.")
\ No newline at end of file
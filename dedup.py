@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import os
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from .models import Resume, LSHBucket
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS  # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+SHINGLE_WORDS = 5
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures must stay comparable across processes and restarts
+_generator = np.random.RandomState(1)
+_PERM_A = _generator.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _generator.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+# Stored for text without a single word: marks the resume as processed (NULL means "not signed yet")
+NO_SIGNATURE = b''
+
+
+def minhash_signature(text: str) -> bytes:
+    """MinHash signature (NUM_PERM x uint32) over word 5-shingles of the normalized text, or NO_SIGNATURE."""
+    tokens = re.findall(r'[a-z0-9]+', (text or '').lower())
+    if not tokens:
+        return NO_SIGNATURE
+    if len(tokens) < SHINGLE_WORDS:
+        shingles = {' '.join(tokens)}
+    else:
+        shingles = {' '.join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+    permuted = ((hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32).tobytes()
+
+
+def band_keys(signature: bytes) -> List[Tuple[int, int]]:
+    """Maps a signature onto one (band, bucket) key per LSH band."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND * 4:(band + 1) * ROWS_PER_BAND * 4]
+        bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little', signed=True)
+        keys.append((band, bucket))
+    return keys
+
+
+def estimate_similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity: the share of MinHash slots two signatures agree on."""
+    return float(np.mean(np.frombuffer(a, dtype=np.uint32) == np.frombuffer(b, dtype=np.uint32)))
+
+
+class DuplicateDetector:
+    """
+    Clusters near-duplicate resumes under one canonical candidate at ingest time.
+
+    A resume with the same email as a stored one, or whose MinHash signature shares an LSH
+    bucket with one and has estimated Jaccard similarity >= DUPLICATE_THRESHOLD, is stored
+    with canonical_id pointing at that candidate's canonical resume.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = float(threshold or os.getenv("DUPLICATE_THRESHOLD", 0.85))
+
+    def _best_match(self, signature: bytes, candidates) -> Optional[int]:
+        best_id, best_score = None, self.threshold
+        for resume_id, canonical_id, other in candidates:
+            if not other:
+                continue
+            score = estimate_similarity(signature, other)
+            if score >= best_score:
+                best_id, best_score = canonical_id or resume_id, score
+        return best_id
+
+    async def find_canonical(self, db: AsyncSession, email: Optional[str], signature: Optional[bytes]) -> Optional[int]:
+        """Returns the canonical resume id this upload duplicates, or None for a new candidate."""
+        if email:
+            same_email = (await db.execute(
+                select(Resume.id, Resume.canonical_id).where(Resume.email == email).order_by(Resume.id).limit(1)
+            )).first()
+            if same_email:
+                return same_email.canonical_id or same_email.id
+        if not signature:
+            return None
+
+        keys = band_keys(signature)
+        candidate_ids = (await db.scalars(
+            select(LSHBucket.resume_id).where(or_(*(and_(LSHBucket.band == band, LSHBucket.bucket == bucket) for band, bucket in keys))).distinct()
+        )).all()
+        if not candidate_ids:
+            return None
+        rows = await db.execute(select(Resume.id, Resume.canonical_id, Resume.minhash).where(Resume.id.in_(candidate_ids)))
+        return self._best_match(signature, rows)
+
+    def add_to_index(self, db, resume_id: int, signature: Optional[bytes]):
+        if signature:
+            db.add_all([LSHBucket(band=band, bucket=bucket, resume_id=resume_id) for band, bucket in band_keys(signature)])
+
+    async def clear(self, db: AsyncSession):
+        await db.execute(delete(LSHBucket))
+
+    async def resolve_canonicals(self, db: AsyncSession, resumes: List[Resume]) -> Dict[int, Resume]:
+        """Maps each resume id onto the resume that represents its candidate (itself if canonical)."""
+        by_id = {r.id: r for r in resumes}
+        missing = {r.canonical_id for r in resumes if r.canonical_id and r.canonical_id not in by_id}
+        if missing:
+            by_id.update({r.id: r for r in (await db.scalars(select(Resume).where(Resume.id.in_(missing)).options(undefer(Resume.raw_text)))).all()})
+        return {r.id: by_id.get(r.canonical_id, r) if r.canonical_id else r for r in resumes}
+
+    def backfill(self, engine):
+        """Signs, indexes and clusters resumes stored before duplicate detection existed."""
+        with engine.begin() as conn:
+            if conn.execute(select(Resume.id).where(Resume.minhash.is_(None)).limit(1)).first() is None:
+                return
+            rows = conn.execute(select(Resume.id, Resume.email, Resume.canonical_id, Resume.minhash).order_by(Resume.id)).all()
+            # Only unsigned resumes need their (compressed) text
+            texts = dict(conn.execute(select(Resume.id, Resume.raw_text).where(Resume.minhash.is_(None))).all())
+
+            buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+            signatures, canonical_of, first_by_email = {}, {}, {}
+            for row in rows:
+                signature = row.minhash if row.minhash is not None else minhash_signature(texts[row.id])
+                canonical = row.canonical_id
+                if canonical is None and row.minhash is None:
+                    canonical = first_by_email.get(row.email) if row.email else None
+                    if canonical is None and signature:
+                        candidates = {rid for key in band_keys(signature) for rid in buckets[key]}
+                        canonical = self._best_match(signature, ((rid, canonical_of[rid], signatures[rid]) for rid in candidates))
+                    if signature:
+                        conn.execute(LSHBucket.__table__.insert(), [
+                            {"band": band, "bucket": bucket, "resume_id": row.id} for band, bucket in band_keys(signature)
+                        ])
+                    conn.execute(update(Resume).where(Resume.id == row.id).values(minhash=signature, canonical_id=canonical))
+                if row.email:
+                    first_by_email.setdefault(row.email, canonical or row.id)
+                if signature:
+                    signatures[row.id], canonical_of[row.id] = signature, canonical
+                    for key in band_keys(signature):
+                        buckets[key].append(row.id)
+            logger.info(f"Computed near-duplicate signatures for {sum(1 for r in rows if r.minhash is None)} existing resumes.")
\ No newline at end of file
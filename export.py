@@ -0,0 +1,126 @@
+import csv
+import io
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from .database import AsyncSessionLocal
+from .models import Resume, JobDescription, MatchResult
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 5000))
+
+COLUMNS = [
+    "rank", "match_id", "job_description_id", "job_title", "resume_id", "candidate_name", "email", "phone",
+    "experience", "skills", "match_score", "summary", "strengths", "gaps", "created_at",
+]
+LIST_COLUMNS = ("skills", "strengths", "gaps")
+
+
+def export_query(job_id: Optional[int], min_score: Optional[float]):
+    """Ranked shortlist rows: one per match result, joined with its resume and job (no raw_text)."""
+    query = (
+        select(
+            MatchResult.id.label("match_id"), MatchResult.job_description_id, JobDescription.title.label("job_title"),
+            MatchResult.resume_id, Resume.name.label("candidate_name"), Resume.email, Resume.phone, Resume.experience,
+            Resume.skills, MatchResult.match_score, MatchResult.summary, MatchResult.strengths, MatchResult.gaps,
+            MatchResult.created_at,
+        )
+        .join(Resume, Resume.id == MatchResult.resume_id)
+        .join(JobDescription, JobDescription.id == MatchResult.job_description_id)
+        .order_by(MatchResult.job_description_id, MatchResult.match_score.desc(), MatchResult.id)
+    )
+    if job_id:
+        query = query.where(MatchResult.job_description_id == job_id)
+    if min_score is not None:
+        query = query.where(MatchResult.match_score >= min_score)
+    return query
+
+
+async def _ranked_chunks(job_id: Optional[int], min_score: Optional[float]) -> AsyncIterator[List[Tuple]]:
+    """
+    Streams rows (in COLUMNS order) from a server-side cursor, EXPORT_CHUNK_ROWS at a time, adding
+    each row's rank within its job. The session is owned here because the response body outlives the request.
+    """
+    current_job, rank = None, 0
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(export_query(job_id, min_score).execution_options(yield_per=EXPORT_CHUNK_ROWS))
+        async for partition in result.partitions():
+            chunk = []
+            for row in partition:
+                if row[1] != current_job:
+                    current_job, rank = row[1], 0
+                rank += 1
+                chunk.append((rank, *row))
+            yield chunk
+
+
+async def stream_csv(job_id: Optional[int], min_score: Optional[float]) -> AsyncIterator[bytes]:
+    list_positions = [COLUMNS.index(column) for column in LIST_COLUMNS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    async for chunk in _ranked_chunks(job_id, min_score):
+        for row in chunk:
+            row = list(row)
+            for position in list_positions:
+                row[position] = "; ".join(row[position] or [])
+            writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object that hands out what has been written so far, keeping its position."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    text_list = pa.list_(pa.string())
+    return pa.schema([
+        ("rank", pa.int32()), ("match_id", pa.int64()), ("job_description_id", pa.int64()), ("job_title", pa.string()),
+        ("resume_id", pa.int64()), ("candidate_name", pa.string()), ("email", pa.string()), ("phone", pa.string()),
+        ("experience", pa.float64()), ("skills", text_list), ("match_score", pa.float64()), ("summary", pa.string()),
+        ("strengths", text_list), ("gaps", text_list), ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+async def stream_parquet(job_id: Optional[int], min_score: Optional[float]) -> AsyncIterator[bytes]:
+    """One Parquet row group per chunk; bytes are sent as soon as each row group is written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for chunk in _ranked_chunks(job_id, min_score):
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays([pa.array(c, type=f.type) for c, f in zip(columns, schema)], schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
\ No newline at end of file
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Resume, DataVersion
+from .database import read_version
+from .job_index import skill_tokens, weighted_cosine
+
+logger = logging.getLogger(__name__)
+
+
+class _GrowableArray:
+    """numpy array with amortized O(1) appends; views of earlier contents stay valid after growth."""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        needed = self.size + len(values)
+        if needed > len(self._data):
+            grown = np.zeros(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+        self._data[self.size:needed] = values
+        self.size = needed
+
+    def view(self) -> np.ndarray:
+        return self._data[:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+
+class CandidateFeatureStore:
+    """
+    Process-local, columnar copy of the resume fields used for rule-based ranking: ids (int64),
+    experience (float32), canonical ids (int32, 0 = canonical) and skills as a CSR matrix of
+    interned skill-token counts. Built once at startup; sync() then appends resumes uploaded
+    through any API process and rebuilds after a reset, so ranking a job against every candidate
+    needs only two tiny queries.
+    """
+
+    VERSION_NAME = "resumes"  # data_versions counter bumped by resets
+    _STATE = ("vocabulary", "_ids", "_experience", "_canonical", "_norms", "_indptr", "_indices", "_counts", "_tokenless")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = asyncio.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._version: Optional[int] = None  # None forces a full reload on the next sync()
+            self._synced_id = 0  # Every resume up to this id has been loaded
+            self.vocabulary: Dict[str, int] = {}
+            self._ids = _GrowableArray(np.int64)
+            self._experience = _GrowableArray(np.float32)
+            self._canonical = _GrowableArray(np.int32)
+            self._norms = _GrowableArray(np.float32)
+            self._indptr = _GrowableArray(np.int64)
+            self._indptr.extend([0])
+            self._indices = _GrowableArray(np.int32)
+            self._counts = _GrowableArray(np.float32)
+            # Only resumes whose skills yield no tokens at all (e.g. "C", "R") keep their raw skill set
+            self._tokenless: Dict[int, frozenset] = {}
+
+    def __len__(self) -> int:
+        return self._ids.size
+
+    @staticmethod
+    def _rows_query():
+        return select(Resume.id, Resume.skills, Resume.experience, Resume.canonical_id).order_by(Resume.id)
+
+    def load(self, engine):
+        """Builds the store from the database (decoding skills JSON once, here, instead of per request)."""
+        with engine.connect() as conn:
+            version = conn.execute(select(DataVersion.version).where(DataVersion.name == self.VERSION_NAME)).scalar() or 0
+            rows = conn.execute(self._rows_query()).all()
+        self._replace(rows, version)
+        logger.info(f"Candidate feature store: {len(self)} resumes, {len(self.vocabulary)} skill terms, {self.memory_bytes()} bytes.")
+
+    def _replace(self, rows, version: int):
+        """Builds fresh arrays from rows, then swaps them in, so concurrent scoring never sees a partial store."""
+        fresh = CandidateFeatureStore()
+        for row in rows:
+            fresh.add(row.id, row.skills, row.experience, row.canonical_id)
+        with self._lock:
+            for name in self._STATE:
+                setattr(self, name, getattr(fresh, name))
+            self._version = version
+            self._synced_id = rows[-1].id if rows else 0
+
+    async def sync(self, db: AsyncSession):
+        """
+        Catches up with the resumes table as written by every API process: appends rows above the
+        last loaded id, and reloads everything after a reset or when the row counts disagree.
+        """
+        async with self._sync_lock:
+            version = await read_version(db, self.VERSION_NAME)
+            count, max_id = (await db.execute(select(func.count(Resume.id), func.coalesce(func.max(Resume.id), 0)))).one()
+            if version == self._version and max_id > self._synced_id:
+                rows = (await db.execute(
+                    self._rows_query().where(Resume.id > self._synced_id, Resume.id <= max_id)
+                )).all()
+                for row in rows:
+                    self.add(row.id, row.skills, row.experience, row.canonical_id)
+                self._synced_id = max_id
+            if version != self._version or len(self) != count:
+                # Reset, or rows deleted / committed out of id order: rebuild off the event loop
+                rows = (await db.execute(self._rows_query())).all()
+                await asyncio.to_thread(self._replace, rows, version)
+                logger.info(f"Reloaded candidate feature store: {len(self)} resumes.")
+
+    def add(self, resume_id: int, skills: Optional[List[str]], experience: Optional[float], canonical_id: Optional[int] = None):
+        tokens = skill_tokens(skills)
+        with self._lock:
+            row = self._ids.size
+            columns = [self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokens]
+            self._indices.extend(columns)
+            self._counts.extend(list(tokens.values()))
+            self._indptr.extend([self._indices.size])
+            self._norms.extend([sum(c * c for c in tokens.values())])
+            self._experience.extend([experience or 0.0])
+            self._canonical.extend([canonical_id or 0])
+            if not tokens and skills:
+                self._tokenless[row] = frozenset(skill.lower() for skill in skills)
+            self._ids.extend([resume_id])
+
+    def memory_bytes(self) -> int:
+        arrays = (self._ids, self._experience, self._canonical, self._norms, self._indptr, self._indices, self._counts)
+        return sum(array.nbytes for array in arrays)
+
+    def _snapshot(self, job_tokens: Dict[str, int]):
+        """Consistent views of the first N rows, plus the job's term counts as a dense vocabulary vector."""
+        with self._lock:
+            rows, nnz = self._ids.size, self._indices.size
+            job = np.zeros(len(self.vocabulary), dtype=np.float32)
+            for token, count in job_tokens.items():
+                if token in self.vocabulary:
+                    job[self.vocabulary[token]] = count
+            return (self._ids.view()[:rows], self._experience.view()[:rows], self._canonical.view()[:rows],
+                    self._norms.view()[:rows], self._counts.view()[:nnz], self._indices.view()[:nnz],
+                    self._indptr.view()[:rows + 1], dict(self._tokenless), job)
+
+    def score(self, required_skills: Optional[List[str]], required_experience: Optional[float]) -> Tuple[np.ndarray, ...]:
+        """Returns (ids, canonical ids, skill, experience, rule-based) arrays for every stored resume."""
+        job_tokens = skill_tokens(required_skills)
+        ids, experience, canonical, norms, counts, indices, indptr, tokenless, job = self._snapshot(job_tokens)
+
+        # One job against N resumes is three sparse matrix-vector products over the shared CSR structure.
+        # Every operand is a small integer count, so float32 products are exact; widen only the results.
+        shape = (len(ids), len(job))
+        product = lambda data, vector: (sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False) @ vector).astype(np.float64)
+        skill = weighted_cosine(
+            product(counts, job),
+            norms.astype(np.float64), product(counts * counts, (job > 0).astype(np.float32)),
+            float(sum(c * c for c in job_tokens.values())), product(np.ones_like(counts), job * job),
+        )
+
+        job_set = {s.lower() for s in required_skills or []}
+        if not job_tokens and job_set:
+            for row, resume_set in tokenless.items():
+                skill[row] = len(resume_set & job_set) / len(job_set)
+
+        job_exp = required_experience or 0.0
+        if job_exp <= 0:
+            exp = np.ones(len(ids))
+        else:
+            exp = np.where(experience > 0, np.minimum(1.0, experience / job_exp), 0.0)
+        return ids, canonical, skill, exp, skill * 0.7 + exp * 0.3
\ No newline at end of file
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Resume, JobDescription
+from .database import read_version, bump_version
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Same tokenization as TfidfVectorizer's default, so matrix scores equal MatchingEngine.calculate_skill_score
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+# Smoothed IDF over a two-document corpus: 1 for terms both sides share, 1 + ln(3/2) for the rest
+UNSHARED_IDF = 1.0 + math.log(1.5)
+
+
+def skill_tokens(skills: Optional[List[str]]) -> Counter:
+    return Counter(TOKEN_PATTERN.findall(' '.join(skill.lower() for skill in skills or [])))
+
+
+def pairwise_skill_scores(a: sparse.csr_matrix, a_norms: np.ndarray, b: sparse.csr_matrix, b_norms: np.ndarray) -> np.ndarray:
+    """
+    N x M TF-IDF cosine between the rows of two term-count matrices over one vocabulary, as if each
+    pair were vectorized on its own. Norms are each row's squared count norm over all of its terms,
+    including those missing from the vocabulary.
+    """
+    a_present, b_present = (a > 0).astype(np.float64), (b > 0).astype(np.float64)
+    return weighted_cosine(
+        (a @ b.T).toarray(),
+        a_norms[:, None], (a.multiply(a) @ b_present.T).toarray(),
+        b_norms[None, :], (a_present @ b.multiply(b).T).toarray(),
+    )
+
+
+def weighted_cosine(dot, a_norms, a_shared, b_norms, b_shared) -> np.ndarray:
+    """
+    Cosine under the pairwise idf from raw-count products: dot is sum(a*b) over shared terms, *_norms
+    are sum(x^2) over all of a side's terms and *_shared are sum(x^2) over the terms the pair shares.
+    """
+    # Only shared terms keep idf 1, so each weighted norm is c^2*|x|^2 minus the (c^2 - 1) share of shared terms
+    c2 = UNSHARED_IDF ** 2
+    denominator = np.sqrt((c2 * a_norms - (c2 - 1.0) * a_shared) * (c2 * b_norms - (c2 - 1.0) * b_shared))
+    dot = np.asarray(dot, dtype=np.float64)
+    return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+
+
+class JobMatrix:
+    """
+    Sparse term-count matrix of a set of jobs' required skills, for scoring many
+    resumes against all of them at once with the rule-based formula.
+    """
+
+    def __init__(self, jobs: Sequence[Tuple[int, Optional[List[str]], Optional[float]]]):
+        self.job_ids = np.array([job_id for job_id, _, _ in jobs], dtype=np.int64)
+        self.vocabulary: Dict[str, int] = {}
+        counts = [skill_tokens(skills) for _, skills, _ in jobs]
+        for tokens in counts:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+        self.counts = self._matrix(counts, len(jobs))
+        self.squared_norms = np.asarray(self.counts.multiply(self.counts).sum(axis=1)).ravel()
+        self.experience = np.array([exp or 0.0 for _, _, exp in jobs], dtype=np.float64)
+        self.skill_sets = [{skill.lower() for skill in skills or []} for _, skills, _ in jobs]
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def _matrix(self, counts: List[Counter], rows: int) -> sparse.csr_matrix:
+        indptr, indices, data = [0], [], []
+        for tokens in counts:
+            for token, count in tokens.items():
+                column = self.vocabulary.get(token)
+                if column is not None:
+                    indices.append(column)
+                    data.append(count)
+            indptr.append(len(indices))
+        return sparse.csr_matrix((np.array(data, dtype=np.float64), indices, indptr), shape=(rows, len(self.vocabulary)))
+
+    def skill_scores(self, resume_skills: List[Optional[List[str]]]) -> np.ndarray:
+        """N x M cosine similarity between each resume's skills and each job's, TF-IDF weighted per pair."""
+        counts = [skill_tokens(skills) for skills in resume_skills]
+        resume_norms = np.array([sum(c * c for c in tokens.values()) for tokens in counts], dtype=np.float64)
+        scores = pairwise_skill_scores(self._matrix(counts, len(counts)), resume_norms, self.counts, self.squared_norms)
+
+        # Pairs with no tokens on either side fall back to plain skill overlap, as in calculate_skill_score
+        for row in np.flatnonzero(resume_norms == 0):
+            resume_set = {skill.lower() for skill in resume_skills[row] or []}
+            if not resume_set:
+                continue
+            for column in np.flatnonzero(self.squared_norms == 0):
+                job_set = self.skill_sets[column]
+                if job_set:
+                    scores[row, column] = len(resume_set & job_set) / len(job_set)
+        return scores
+
+    def experience_scores(self, resume_experience: List[Optional[float]]) -> np.ndarray:
+        resume_exp = np.array([exp or 0.0 for exp in resume_experience], dtype=np.float64)[:, None]
+        job_exp = self.experience[None, :]
+        ratio = np.divide(resume_exp, job_exp, out=np.ones((len(resume_exp), len(self))), where=job_exp > 0)
+        scores = np.minimum(1.0, ratio)
+        scores[(resume_exp <= 0) & (job_exp > 0)] = 0.0
+        return scores
+
+    def score(self, resumes: List[Resume]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns (skill, experience, rule-based) N x M score matrices for the given resumes."""
+        skill = self.skill_scores([r.skills for r in resumes])
+        experience = self.experience_scores([r.experience for r in resumes])
+        return skill, experience, skill * 0.7 + experience * 0.3
+
+    def top_jobs(self, resume: Resume, k: int) -> List[Tuple[int, Dict]]:
+        """The k best-scoring jobs for a resume as (job_id, rule scores), best first."""
+        if not len(self):
+            return []
+        skill, experience, rule = (m[0] for m in self.score([resume]))
+        k = min(k, len(self))
+        top = np.argpartition(-rule, k - 1)[:k]
+        top = top[np.argsort(-rule[top], kind="stable")]
+        return [(int(self.job_ids[i]), {
+            "skill_score": float(skill[i]),
+            "exp_score": float(experience[i]),
+            "rule_based_score": float(rule[i]),
+        }) for i in top]
+
+
+class OpenJobIndex:
+    """
+    Caches the JobMatrix of all open jobs. Creating, opening, closing or deleting jobs bumps the
+    'open_jobs' row of data_versions (see bump); a one-row read of it tells every API process
+    when to rebuild.
+    """
+
+    VERSION_NAME = "open_jobs"
+
+    def __init__(self):
+        self._matrix: Optional[JobMatrix] = None
+        self._signature = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def _current_signature(cls, db: AsyncSession) -> int:
+        return await read_version(db, cls.VERSION_NAME)
+
+    @classmethod
+    async def bump(cls, db: AsyncSession):
+        """Marks the open jobs as changed; call in the same transaction as the change."""
+        await bump_version(db, cls.VERSION_NAME)
+
+    def clear(self):
+        self._matrix, self._signature = None, None
+
+    async def matrix(self, db: AsyncSession) -> JobMatrix:
+        signature = await self._current_signature(db)
+        if self._matrix is not None and signature == self._signature:
+            return self._matrix
+        async with self._lock:
+            if self._matrix is None or signature != self._signature:
+                rows = (await db.execute(
+                    select(JobDescription.id, JobDescription.required_skills, JobDescription.required_experience)
+                    .where(JobDescription.is_open.is_(True)).order_by(JobDescription.id)
+                )).all()
+                self._matrix = await asyncio.to_thread(JobMatrix, [tuple(row) for row in rows])
+                self._signature = signature
+                logger.info(f"Built open-job matrix: {len(rows)} jobs, {len(self._matrix.vocabulary)} skill terms.")
+        return self._matrix
+
+    async def top_jobs(self, db: AsyncSession, resume: Resume, k: int) -> List[Tuple[int, Dict]]:
+        matrix = await self.matrix(db)
+        with timed("reverse_scoring"):
+            return matrix.top_jobs(resume, k)
\ No newline at end of file
@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from .metrics import LLM_TOKENS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+
+class LLMProvider:
+    """Base class for chat-completion backends that answer with a single JSON object."""
+
+    name = "base"
+
+    def __init__(self, model: Optional[str] = None, max_tokens: Optional[int] = None, temperature: Optional[float] = None):
+        self.model = model or os.getenv("LLM_MODEL", DEFAULT_MODEL)
+        self.max_tokens = int(max_tokens or os.getenv("LLM_MAX_TOKENS", 1500))
+        self.temperature = float(temperature if temperature is not None else os.getenv("LLM_TEMPERATURE", 0.1))
+
+    @staticmethod
+    def _messages(system_prompt: str, user_prompt: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def complete_json(self, system_prompt: str, user_prompt: str) -> str:
+        """Returns the raw JSON text produced by the model."""
+        raise NotImplementedError
+
+    def _record_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        if prompt_tokens:
+            LLM_TOKENS.inc(prompt_tokens, provider=self.name, kind="prompt")
+        if completion_tokens:
+            LLM_TOKENS.inc(completion_tokens, provider=self.name, kind="completion")
+
+    async def acomplete_json(self, system_prompt: str, user_prompt: str) -> str:
+        """Async variant. Providers without a native async client run the sync call in a worker thread."""
+        return await asyncio.to_thread(self.complete_json, system_prompt, user_prompt)
+
+    def close(self):
+        """Releases pooled connections held by the provider."""
+        pass
+
+    async def aclose(self):
+        self.close()
+
+
+class GroqProvider(LLMProvider):
+    """Groq cloud inference. Sync and async clients are created once and reused across calls."""
+
+    name = "groq"
+
+    def __init__(self, api_key: str, **kwargs):
+        super().__init__(**kwargs)
+        from groq import Groq, AsyncGroq
+        self.client = Groq(api_key=api_key)
+        self.async_client = AsyncGroq(api_key=api_key)
+
+    @classmethod
+    def from_env(cls) -> Optional["GroqProvider"]:
+        try:
+            from groq import APIError
+            api_key = os.getenv("GROQ_API_KEY")
+            if not api_key or api_key in ["", "your_actual_groq_api_key_here"]:
+                return None
+
+            provider = cls(api_key=api_key)
+            # Test connection with a minimal request to validate the key
+            provider.client.chat.completions.create(
+                messages=[{"role": "user", "content": "test"}],
+                model=provider.model,
+                max_tokens=2
+            )
+            return provider
+        except ImportError:
+            logger.warning("'groq' library not installed. To use the Groq API, run: pip install groq")
+            return None
+        except APIError as e:
+            logger.error(f"❌ Groq API key is invalid or expired: {e.message}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ An unexpected error occurred during Groq initialization: {e}")
+            return None
+
+    def _request(self, system_prompt: str, user_prompt: str) -> Dict:
+        return dict(
+            messages=self._messages(system_prompt, user_prompt),
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            response_format={"type": "json_object"}
+        )
+
+    def _content(self, response) -> str:
+        if response.usage:
+            self._record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+        return response.choices[0].message.content
+
+    def complete_json(self, system_prompt: str, user_prompt: str) -> str:
+        response = self.client.chat.completions.create(**self._request(system_prompt, user_prompt))
+        return self._content(response)
+
+    async def acomplete_json(self, system_prompt: str, user_prompt: str) -> str:
+        response = await self.async_client.chat.completions.create(**self._request(system_prompt, user_prompt))
+        return self._content(response)
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        self.client.close()
+        await self.async_client.close()
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    Any server exposing the OpenAI `/chat/completions` API (vLLM, llama.cpp, Ollama, LM Studio, OpenAI itself).
+    Connections are pooled with keep-alive through long-lived httpx clients.
+    """
+
+    name = "openai"
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: float = 60.0, **kwargs):
+        super().__init__(**kwargs)
+        import httpx
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.timeout = timeout
+        self.client = httpx.Client(base_url=self.base_url, headers=self.headers, timeout=timeout)
+        self._async_client = None
+
+    @classmethod
+    def from_env(cls) -> Optional["OpenAICompatibleProvider"]:
+        base_url = os.getenv("LLM_BASE_URL")
+        if not base_url:
+            logger.warning("LLM_BASE_URL is not set. Skipping the OpenAI-compatible provider.")
+            return None
+        try:
+            return cls(
+                base_url=base_url,
+                api_key=os.getenv("LLM_API_KEY"),
+                timeout=float(os.getenv("LLM_TIMEOUT", 60))
+            )
+        except ImportError:
+            logger.warning("'httpx' library not installed. To use an OpenAI-compatible server, run: pip install httpx")
+            return None
+
+    @property
+    def async_client(self):
+        # Created on first use so it binds to the running event loop
+        if self._async_client is None:
+            import httpx
+            self._async_client = httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=self.timeout)
+        return self._async_client
+
+    def _payload(self, system_prompt: str, user_prompt: str) -> Dict:
+        return {
+            "model": self.model,
+            "messages": self._messages(system_prompt, user_prompt),
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "response_format": {"type": "json_object"}
+        }
+
+    def _content(self, response) -> str:
+        response.raise_for_status()
+        body = response.json()
+        usage = body.get("usage") or {}
+        self._record_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        return body["choices"][0]["message"]["content"]
+
+    def complete_json(self, system_prompt: str, user_prompt: str) -> str:
+        return self._content(self.client.post("/chat/completions", json=self._payload(system_prompt, user_prompt)))
+
+    async def acomplete_json(self, system_prompt: str, user_prompt: str) -> str:
+        return self._content(await self.async_client.post("/chat/completions", json=self._payload(system_prompt, user_prompt)))
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        self.client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline, deterministic backend for development and load testing.
+    The same prompt always yields the same analysis; LLM_STUB_LATENCY_MS simulates model latency.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency_ms: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.model = "stub"
+        self.latency_ms = latency_ms
+
+    @classmethod
+    def from_env(cls) -> "StubProvider":
+        return cls(latency_ms=float(os.getenv("LLM_STUB_LATENCY_MS", 0)))
+
+    def _respond(self, system_prompt: str, user_prompt: str) -> str:
+        digest = hashlib.sha256(user_prompt.encode("utf-8")).digest()
+        score = 1.0 + int.from_bytes(digest[:4], "big") % 901 / 100.0
+        content = json.dumps({
+            "match_score": round(score, 1),
+            "summary": "Deterministic stub analysis generated without calling a language model.",
+            "strengths": ["Stub provider: no model was consulted."],
+            "gaps": ["Stub provider: no model was consulted."],
+            "is_student": False
+        })
+        # Approximate usage (~4 characters per token) so token metrics stay meaningful offline
+        self._record_usage((len(system_prompt) + len(user_prompt)) // 4, len(content) // 4)
+        return content
+
+    def complete_json(self, system_prompt: str, user_prompt: str) -> str:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return self._respond(system_prompt, user_prompt)
+
+    async def acomplete_json(self, system_prompt: str, user_prompt: str) -> str:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000.0)
+        return self._respond(system_prompt, user_prompt)
+
+
+PROVIDERS = {
+    GroqProvider.name: GroqProvider,
+    OpenAICompatibleProvider.name: OpenAICompatibleProvider,
+    StubProvider.name: StubProvider,
+}
+
+
+def create_provider(spec: Optional[str] = None) -> Optional[LLMProvider]:
+    """
+    Builds the first usable provider from a comma-separated priority list, e.g. "openai,groq,stub".
+    Falls back to LLM_PROVIDER and then to Groq. Returns None when no backend is usable,
+    which puts the service in rule-based mode ("none" requests that explicitly).
+    """
+    spec = spec or os.getenv("LLM_PROVIDER", GroqProvider.name)
+    for name in (part.strip().lower() for part in spec.split(",")):
+        if not name or name == "none":
+            continue
+        provider_cls = PROVIDERS.get(name)
+        if provider_cls is None:
+            logger.warning(f"Unknown LLM provider '{name}'. Choose from: {', '.join(PROVIDERS)}.")
+            continue
+        provider = provider_cls.from_env()
+        if provider is not None:
+            return provider
+    return None
\ No newline at end of file
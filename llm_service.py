@@ -1,53 +1,32 @@
-import os
-from typing import Dict, Tuple
+import logging
+from typing import Dict, Optional, Tuple
 import json
-import re
+import time
+from .llm_providers import LLMProvider, create_provider
+from .prompt_builder import PromptBuilder
+from .metrics import LLM_REQUEST_SECONDS, LLM_REQUESTS
+
+logger = logging.getLogger(__name__)
 
 class LLMService:
-    def __init__(self):
+    def __init__(self, provider: Optional[LLMProvider] = None, prompt_builder: Optional[PromptBuilder] = None):
         try:
             from dotenv import load_dotenv
             load_dotenv()
         except ImportError:
-            print("Warning: python-dotenv not installed. Skipping .env file loading.")
+            logger.warning("python-dotenv not installed. Skipping .env file loading.")
         
-        self.api_available = False
-        self.active_provider = "none"
-        self.client = self._init_groq()
-
-        if self.client:
-            self.active_provider = "groq"
-            self.api_available = True
-            print("✅ Groq API is configured and available for AI matching.")
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.provider = provider or create_provider()
+        self.api_available = self.provider is not None
+
+        if self.provider:
+            self.active_provider = self.provider.name
+            logger.info(f"✅ LLM provider '{self.provider.name}' ({self.provider.model}) is configured and available for AI matching.")
         else:
-            print("⚠️ No valid AI API key found. Service will operate in rule-based analysis mode.")
+            logger.warning("⚠️ No valid AI API key found. Service will operate in rule-based analysis mode.")
             self.active_provider = "rule_based_fallback"
     
-    def _init_groq(self):
-        try:
-            from groq import Groq, APIError
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key or api_key in ["", "your_actual_groq_api_key_here"]:
-                return None
-            
-            client = Groq(api_key=api_key)
-            # Test connection with a minimal request to validate the key
-            client.chat.completions.create(
-                messages=[{"role": "user", "content": "test"}], 
-                model="llama-3.1-8b-instant", # <-- CORRECTED MODEL
-                max_tokens=2
-            )
-            return client
-        except ImportError:
-            print("Warning: 'groq' library not installed. To use the Groq API, run: pip install groq")
-            return None
-        except APIError as e:
-            print(f"❌ Groq API key is invalid or expired: {e.message}")
-            return None
-        except Exception as e:
-            print(f"❌ An unexpected error occurred during Groq initialization: {e}")
-            return None
-    
     def match_resume_job(self, resume_data: Dict, job_description: Dict) -> Dict:
         """Orchestrates the matching process using the best available method."""
         if not self.api_available:
@@ -55,34 +34,36 @@ class LLMService:
         
         system_prompt, user_prompt = self._create_matching_prompts(resume_data, job_description)
         
+        started = time.perf_counter()
         try:
-            if self.active_provider == "groq":
-                return self._call_groq_api(system_prompt, user_prompt)
-            else:
-                return self.get_rule_based_analysis(resume_data, job_description)
+            response_text = self.provider.complete_json(system_prompt, user_prompt)
         except Exception as e:
-            print(f"❌ LLM API Error: {e}. Falling back to rule-based analysis.")
+            self._observe_call(started, "error")
+            logger.error(f"❌ LLM API Error: {e}. Falling back to rule-based analysis.")
             return self.get_rule_based_analysis(resume_data, job_description)
+        self._observe_call(started, "success")
+        return self._parse_llm_response(response_text)
 
-    def _call_groq_api(self, system_prompt: str, user_prompt: str) -> Dict:
-        """Executes the API call to Groq with the prepared prompts."""
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
-        
-        response = self.client.chat.completions.create(
-            messages=messages,
-            model="llama-3.1-8b-instant", # <-- CORRECTED MODEL
-            temperature=0.1,
-            max_tokens=1500,
-            response_format={"type": "json_object"}
-        )
-        
-        result_text = response.choices[0].message.content
-        print(f"🔍 Raw LLM Response: {result_text[:250]}...")
-        
-        return self._parse_llm_response(result_text)
+    async def amatch_resume_job(self, resume_data: Dict, job_description: Dict) -> Dict:
+        """Async counterpart of match_resume_job for use inside the event loop."""
+        if not self.api_available:
+            return self.get_rule_based_analysis(resume_data, job_description)
+
+        system_prompt, user_prompt = self._create_matching_prompts(resume_data, job_description)
+
+        started = time.perf_counter()
+        try:
+            response_text = await self.provider.acomplete_json(system_prompt, user_prompt)
+        except Exception as e:
+            self._observe_call(started, "error")
+            logger.error(f"❌ LLM API Error: {e}. Falling back to rule-based analysis.")
+            return self.get_rule_based_analysis(resume_data, job_description)
+        self._observe_call(started, "success")
+        return self._parse_llm_response(response_text)
+
+    def _observe_call(self, started: float, outcome: str):
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, provider=self.provider.name)
+        LLM_REQUESTS.inc(provider=self.provider.name, outcome=outcome)
 
     def _create_matching_prompts(self, resume_data: Dict, job_description: Dict) -> Tuple[str, str]:
         """Creates a powerful system and user prompt pair using few-shot learning."""
@@ -116,8 +97,6 @@ Here is a perfect example of your required output format:
         is_student = resume_data.get('experience', 0.0) <= 1.5
         student_context = "This is a STUDENT/ENTRY-LEVEL profile. Prioritize potential and foundational skills." if is_student else "This is an EXPERIENCED PROFESSIONAL profile. Evaluate against specific years of experience."
 
-        def clean_text(text): return re.sub(r'\s+', ' ', text).strip()
-
         user_prompt = f"""
 Analyze the following data and generate the JSON response.
 
@@ -125,18 +104,19 @@ Analyze the following data and generate the JSON response.
 - **Type**: {student_context}
 - **Experience (Years)**: {resume_data.get('experience', 0)}
 - **Skills**: {', '.join(resume_data.get('skills', []))}
-- **Resume Snippet**: "{clean_text(resume_data.get('raw_text', ''))[:800]}..."
+- **Resume Highlights**: "{self.prompt_builder.resume_snippet(resume_data, job_description.get('required_skills') or [])}"
 
 **JOB DESCRIPTION**
 - **Title**: {job_description.get('title', 'N/A')}
 - **Required Experience (Years)**: {job_description.get('required_experience', 0)}
 - **Required Skills**: {', '.join(job_description.get('required_skills', []))}
-- **Details**: "{clean_text(job_description.get('description', ''))[:800]}..."
+- **Details**: "{self.prompt_builder.job_details(job_description)}"
 """
         return system_prompt, user_prompt
 
     def _parse_llm_response(self, response_text: str) -> Dict:
         """Safely parses the LLM's JSON output."""
+        logger.debug("🔍 Raw LLM Response: %s...", response_text[:250])
         try:
             result = json.loads(response_text)
             validated = {
@@ -147,10 +127,10 @@ Analyze the following data and generate the JSON response.
                 "is_student": bool(result.get('is_student', False))
             }
             validated['match_score'] = max(1.0, min(10.0, validated['match_score']))
-            print(f"✅ Successfully parsed LLM response: Score {validated['match_score']}/10")
+            logger.debug("✅ Successfully parsed LLM response: Score %s/10", validated['match_score'])
             return validated
         except (json.JSONDecodeError, TypeError, ValueError) as e:
-            print(f"❌ JSON parse error: {e}. Response: {response_text[:200]}")
+            logger.error(f"❌ JSON parse error: {e}. Response: {response_text[:200]}")
             return self._get_fallback_response()
 
     def get_rule_based_analysis(self, resume_data: Dict, job_description: Dict) -> Dict:
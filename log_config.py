@@ -0,0 +1,13 @@
+import logging
+import os
+
+
+def configure_logging():
+    """
+    Sets up leveled logging for the API and parser worker processes.
+    LOG_LEVEL=WARNING (or higher) silences the per-resume and per-match messages in production.
+    """
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+    )
\ No newline at end of file
@@ -1,23 +1,53 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, BackgroundTasks
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import text, delete
+import asyncio
+import logging
 import os
-import shutil
-from typing import List
+import time
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks, Request, Query, Header
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse, FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, delete, select
+from sqlalchemy.orm import undefer
+from typing import List, Optional
 
-from .database import get_db, create_tables
+from .database import get_async_db, create_tables, AsyncSessionLocal, async_engine, engine, bump_version
 from .models import Resume, JobDescription, MatchResult
 from .schemas import (
-    ResumeResponse, JobDescriptionCreate, JobDescriptionResponse,
-    MatchResponse, BulkMatchRequest, BulkMatchResponse, MatchResultResponse
+    ResumeResponse, ResumeListItem, JobDescriptionCreate, JobDescriptionResponse,
+    MatchResponse, BulkMatchRequest, BulkMatchResponse, MatchResultResponse, ResumeSearchResult,
+    JobStatusUpdate, JobMatchResponse, ResumeJobMatchesResponse, CandidateRanking, AnalyzeResumeResponse
 )
 from .pdf_parser import ResumeParser
+from .parse_pool import ParsePool
 from .matching_engine import MatchingEngine
+from .search import ResumeSearchIndex
+from .dedup import DuplicateDetector
+from .job_index import OpenJobIndex
+from .export import stream_csv, stream_parquet
+from .feature_store import CandidateFeatureStore
+from .compression import migrate_storage
+from .profiling import ProfilingMiddleware, RequestProfiler
+from .log_config import configure_logging
+from .metrics import REGISTRY, HTTP_REQUEST_SECONDS, Gauge, timed
+
+logger = logging.getLogger(__name__)
+
+configure_logging()
 
 # Create database tables on startup
 create_tables()
+migrate_storage(engine)
+search_index = ResumeSearchIndex(engine.dialect.name)
+search_index.create(engine)
+duplicate_detector = DuplicateDetector()
+duplicate_detector.backfill(engine)
+# Per-process copy of the ranking features; synced with the resumes table before each ranking
+feature_store = CandidateFeatureStore()
+feature_store.load(engine)
+REGISTRY.register(Gauge(
+    "resume_screener_feature_store_bytes", "Memory held by the candidate feature store arrays.", callback=feature_store.memory_bytes))
+REGISTRY.register(Gauge(
+    "resume_screener_feature_store_resumes", "Resumes in the candidate feature store.", callback=lambda: len(feature_store)))
 
 app = FastAPI(
     title="Smart Resume Screener API",
@@ -34,106 +64,341 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template (e.g. /resumes/{id}) rather than raw path to keep cardinality bounded
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code
+    )
+    return response
+
+# Opt-in request profiling; when PROFILE_TOKEN is unset the middleware is not installed at all
+request_profiler = RequestProfiler()
+if request_profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
 # Initialize services (singletons for the app's lifecycle)
 parser = ResumeParser()
+parse_pool = ParsePool(parser)
 matching_engine = MatchingEngine()
+job_index = OpenJobIndex()
 
-# Create a directory for temporary file uploads
-UPLOAD_DIR = "temp_uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Score every new upload against the open jobs in the background (LLM only above the escalation threshold)
+MATCH_ON_UPLOAD = os.getenv("MATCH_ON_UPLOAD", "false").lower() in ("1", "true", "yes")
+REVERSE_MATCH_TOP_K = int(os.getenv("REVERSE_MATCH_TOP_K", 10))
 
 @app.on_event("startup")
 async def startup_event():
-    print("API starting up. Services initialized.")
+    logger.info("API starting up. Services initialized.")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    parse_pool.shutdown()
+    await async_engine.dispose()
+    provider = matching_engine.llm_service.provider
+    if provider:
+        await provider.aclose()
 
 @app.get("/", tags=["General"])
 def read_root():
     """Root endpoint providing basic API information."""
     return {"message": "Welcome to the Smart Resume Screener API", "version": "2.0.0"}
 
+async def reject_duplicate_filename(db: AsyncSession, filename: str):
+    existing_resume = await db.scalar(select(Resume.id).where(Resume.filename == filename))
+    if existing_resume:
+        raise HTTPException(
+            status_code=409,
+            detail=f"A resume with the filename '{filename}' already exists."
+        )
+
+async def add_resume(db: AsyncSession, filename: str, parsed_data: dict) -> Resume:
+    """Adds a parsed resume to the session with its search and LSH index entries; the caller commits."""
+    # Cluster re-uploads of the same candidate under their earliest resume
+    with timed("dedup"):
+        canonical_id = await duplicate_detector.find_canonical(db, parsed_data.get('email'), parsed_data.get('minhash'))
+    if canonical_id:
+        logger.info(f"'{filename}' is a near-duplicate of resume {canonical_id}.")
+
+    # Create a new resume record in the database
+    resume = Resume(
+        filename=filename,
+        canonical_id=canonical_id,
+        **parsed_data
+    )
+    
+    db.add(resume)
+    with timed("db_write"):
+        await db.flush()
+        await search_index.index_resume(db, resume)
+        duplicate_detector.add_to_index(db, resume.id, resume.minhash)
+    return resume
+
 @app.post("/upload-resume/", response_model=ResumeResponse, tags=["Resumes"])
-async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_resume(background_tasks: BackgroundTasks, file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
     """Upload a resume PDF, parse it, and save the extracted data to the database."""
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported.")
 
     # Prevent duplicate filenames
-    existing_resume = db.query(Resume).filter(Resume.filename == file.filename).first()
-    if existing_resume:
-        raise HTTPException(
-            status_code=409,
-            detail=f"A resume with the filename '{file.filename}' already exists."
-        )
+    await reject_duplicate_filename(db, file.filename)
 
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
     try:
-        # Save the uploaded file temporarily
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Parse the resume using the advanced parser
-        parsed_data = parser.parse_resume(file_path)
+        # Parse the resume in memory, off the event loop
+        parsed_data = await parse_pool.parse(await file.read(), file.filename)
         if parsed_data.get('name') == 'Parsing Failed':
              raise HTTPException(status_code=500, detail="Failed to extract text or parse the resume.")
         
-        # Create a new resume record in the database
-        resume = Resume(
-            filename=file.filename,
-            **parsed_data
-        )
-        
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
+        resume = await add_resume(db, file.filename, parsed_data)
+        with timed("db_write"):
+            await db.commit()
+            # Only server defaults need reloading; the text is already in memory and stays uncompressed there
+            await db.refresh(resume, ["created_at"])
+
+        if MATCH_ON_UPLOAD:
+            background_tasks.add_task(match_new_resume, resume.id)
         
         return resume
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"An error occurred while processing the resume: {str(e)}")
-    
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(file_path):
-            os.remove(file_path)
 
-@app.get("/resumes/", response_model=List[ResumeResponse], tags=["Resumes"])
-def get_all_resumes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Retrieve a list of all parsed resumes from the database."""
-    resumes = db.query(Resume).order_by(Resume.created_at.desc()).offset(skip).limit(limit).all()
-    return resumes
+@app.post("/analyze-resume/", response_model=AnalyzeResumeResponse, tags=["Matching"])
+async def analyze_resume(
+    resume: UploadFile = File(...),
+    description: str = Form(..., min_length=1),
+    title: Optional[str] = Form(None),
+    persist: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    One-shot screen of a PDF against a free-text job description: one (cached) parse and one LLM call.
+    Nothing is written unless persist=true, which saves the resume, a closed job and the match result.
+    """
+    if not resume.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported.")
+    description = description.strip()
+    if not description:
+        raise HTTPException(status_code=422, detail="The job description must not be empty.")
+    if persist:
+        await reject_duplicate_filename(db, resume.filename)
+
+    parsed_data = await parse_pool.parse(await resume.read(), resume.filename)
+    if parsed_data.get('name') == 'Parsing Failed':
+        raise HTTPException(status_code=500, detail="Failed to extract text or parse the resume.")
+
+    # Same skill matcher as resumes, so job and candidate skills share one vocabulary
+    job = JobDescription(
+        title=(title or "").strip() or description.splitlines()[0][:80],
+        description=description,
+        required_skills=parser.extract_skills(description),
+        required_experience=parser.extract_required_experience(description),
+        is_open=False,  # Ad-hoc jobs never show up in reverse matching
+    )
+    candidate = Resume(filename=resume.filename, **parsed_data)
+    analysis = await matching_engine.aanalyze(candidate, job)
+
+    match_id = None
+    if persist:
+        try:
+            candidate = await add_resume(db, resume.filename, parsed_data)
+            db.add(job)
+            with timed("db_write"):
+                await db.flush()
+                record = MatchResult(**{**_stored_fields(analysis), 'resume_id': candidate.id, 'job_description_id': job.id})
+                db.add(record)
+                await db.commit()
+            match_id = record.id
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"An error occurred while saving the analysis: {str(e)}")
+
+    resume_skills = set(candidate.skills or [])
+    return {
+        "id": match_id,
+        "resume_id": candidate.id,
+        "candidate_name": candidate.name,
+        "experience": candidate.experience,
+        "required_skills": job.required_skills,
+        "skills_matched": [skill for skill in job.required_skills if skill in resume_skills],
+        "skills_missing": [skill for skill in job.required_skills if skill not in resume_skills],
+        "rule_based_score": analysis['rule_based_score'],
+        "match_score": analysis['match_score'],
+        "summary": analysis['summary'],
+        "strengths": analysis['strengths'],
+        "gaps": analysis['gaps'],
+    }
+
+@app.get("/resumes/", response_model=List[ResumeListItem], tags=["Resumes"])
+async def get_all_resumes(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    """Retrieve a list of all parsed resumes from the database (without their raw text)."""
+    resumes = await db.scalars(select(Resume).order_by(Resume.created_at.desc()).offset(skip).limit(limit))
+    return resumes.all()
+
+@app.get("/resumes/search", response_model=List[ResumeSearchResult], tags=["Resumes"])
+async def search_resumes(
+    q: Optional[str] = Query(None, description='Words, "quoted phrases", prefix* and -excluded terms'),
+    skills: List[str] = Query([], description="Every listed skill must appear in the candidate's skills"),
+    min_experience: Optional[float] = None,
+    max_experience: Optional[float] = None,
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ranked full-text search over resumes with highlighted snippets."""
+    if not (q and q.strip()) and not skills:
+        raise HTTPException(status_code=400, detail="Provide a search query or at least one skill filter.")
+    if not search_index.supported:
+        raise HTTPException(status_code=501, detail=f"Full-text search is not supported on '{search_index.dialect}'.")
+    with timed("search"):
+        return await search_index.search(db, q, skills, min_experience, max_experience, limit, offset)
+
+@app.get("/resumes/{resume_id}/job-matches", response_model=ResumeJobMatchesResponse, tags=["Matching"])
+async def match_resume_to_jobs(
+    resume_id: int,
+    background_tasks: BackgroundTasks,
+    top_k: int = Query(REVERSE_MATCH_TOP_K, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Rank all open jobs for one resume. The best pairs are also analysed by the LLM and saved, once:
+    pairs that already have a saved match result reuse it, so repeated requests cost no LLM calls.
+    """
+    resume = await db.get(Resume, resume_id, options=[undefer(Resume.raw_text)])
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found.")
+
+    results, jobs = await reverse_match(db, resume, top_k)
+    new_results = [_stored_fields(r) for r in results if r['escalated'] and not r['reused']]
+    if new_results:
+        background_tasks.add_task(save_match_results, new_results)
+    return ResumeJobMatchesResponse(
+        resume_id=resume.id,
+        results=[JobMatchResponse(job_description=jobs[r['job_description_id']], **r) for r in results]
+    )
+
+async def reverse_match(db: AsyncSession, resume: Resume, top_k: int):
+    """
+    Scores a resume against every open job in one vectorized pass and matches the top_k. A near-duplicate
+    is matched as its canonical resume, so saved results and LLM spend are shared per candidate.
+    """
+    resume = (await duplicate_detector.resolve_canonicals(db, [resume]))[resume.id]
+    ranked = await job_index.top_jobs(db, resume, top_k)
+    if not ranked:
+        return [], {}
+    jobs = {job.id: job for job in (await db.scalars(
+        select(JobDescription).where(JobDescription.id.in_([job_id for job_id, _ in ranked]))
+    )).all()}
+    # Latest saved result per job for this resume (ascending ids, so later rows win)
+    stored = {row.job_description_id: {
+        'match_score': row.match_score, 'summary': row.summary, 'strengths': row.strengths, 'gaps': row.gaps,
+    } for row in (await db.scalars(
+        select(MatchResult).where(MatchResult.resume_id == resume.id, MatchResult.job_description_id.in_(list(jobs)))
+        .order_by(MatchResult.id)
+    )).all()}
+    results = await matching_engine.amatch_jobs(resume, [(jobs[job_id], rules) for job_id, rules in ranked if job_id in jobs], stored)
+    return results, jobs
+
+async def match_new_resume(resume_id: int):
+    """Background reverse match for a fresh upload; only LLM-escalated pairs are stored."""
+    async with AsyncSessionLocal() as db:
+        resume = await db.get(Resume, resume_id, options=[undefer(Resume.raw_text)])
+        if not resume:
+            return
+        results, _ = await reverse_match(db, resume, REVERSE_MATCH_TOP_K)
+    escalated = [_stored_fields(r) for r in results if r['escalated'] and not r['reused']]
+    logger.info(f"Resume {resume_id}: {len(escalated)} of {len(results)} top jobs escalated to the LLM.")
+    if escalated:
+        await save_match_results(escalated)
+
+def _stored_fields(result: dict) -> dict:
+    return {k: v for k, v in result.items() if k not in ('rule_based_score', 'escalated', 'reused')}
 
 @app.post("/job-descriptions/", response_model=JobDescriptionResponse, tags=["Jobs"])
-def create_job_description(job: JobDescriptionCreate, db: Session = Depends(get_db)):
+async def create_job_description(job: JobDescriptionCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new job description and save it to the database."""
     db_job = JobDescription(**job.dict())
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await job_index.bump(db)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 @app.get("/job-descriptions/", response_model=List[JobDescriptionResponse], tags=["Jobs"])
-def get_all_job_descriptions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_all_job_descriptions(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
     """Retrieve a list of all job descriptions from the database."""
-    jobs = db.query(JobDescription).order_by(JobDescription.created_at.desc()).offset(skip).limit(limit).all()
-    return jobs
+    jobs = await db.scalars(select(JobDescription).order_by(JobDescription.created_at.desc()).offset(skip).limit(limit))
+    return jobs.all()
+
+@app.get("/job-descriptions/{job_id}/candidates", response_model=List[CandidateRanking], tags=["Matching"])
+async def rank_candidates(
+    job_id: int,
+    top_k: int = Query(50, ge=1, le=1000),
+    include_duplicates: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Rule-based shortlist of all candidates for a job, ranked in memory from the feature store."""
+    job = await db.get(JobDescription, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job Description not found.")
+    # Picks up uploads and resets made through any API process
+    await feature_store.sync(db)
+    # Scoring every stored resume is CPU-bound, so keep it off the event loop
+    ranked = await asyncio.to_thread(matching_engine.rank_candidates, job, feature_store, top_k, include_duplicates)
+
+    # Names and emails only for the returned page, in one narrow query
+    contacts = {row.id: row for row in await db.execute(
+        select(Resume.id, Resume.name, Resume.email).where(Resume.id.in_([r['resume_id'] for r in ranked]))
+    )}
+    return [
+        CandidateRanking(name=contacts[r['resume_id']].name, email=contacts[r['resume_id']].email, **r)
+        for r in ranked if r['resume_id'] in contacts
+    ]
+
+@app.patch("/job-descriptions/{job_id}", response_model=JobDescriptionResponse, tags=["Jobs"])
+async def update_job_status(job_id: int, update: JobStatusUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Open or close a job; closed jobs are left out of resume-to-jobs matching."""
+    job = await db.get(JobDescription, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job Description not found.")
+    job.is_open = update.is_open
+    await job_index.bump(db)
+    await db.commit()
+    job_index.clear()
+    await db.refresh(job)
+    return job
 
 @app.post("/bulk-match/", response_model=BulkMatchResponse, tags=["Matching"])
-def bulk_match_resumes(bulk_request: BulkMatchRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def bulk_match_resumes(bulk_request: BulkMatchRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db)):
     """Match multiple resumes against a single job description."""
-    job = db.query(JobDescription).filter(JobDescription.id == bulk_request.job_description_id).first()
+    job = await db.get(JobDescription, bulk_request.job_description_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job Description not found.")
     
-    resumes_to_match = db.query(Resume).filter(Resume.id.in_(bulk_request.resume_ids)).all()
+    resumes_to_match = (await db.scalars(
+        select(Resume).where(Resume.id.in_(bulk_request.resume_ids)).options(undefer(Resume.raw_text))
+    )).all()
     if not resumes_to_match:
         raise HTTPException(status_code=404, detail="None of the provided resume IDs were found.")
 
-    # Perform matching
-    match_results = matching_engine.bulk_match(resumes_to_match, job)
+    # Match each candidate once: near-duplicates share the result of their canonical resume
+    representatives = await duplicate_detector.resolve_canonicals(db, resumes_to_match)
+    unique_resumes = list({r.id: r for r in representatives.values()}.values())
+    cluster_results = {result['resume_id']: result for result in await matching_engine.abulk_match(unique_resumes, job)}
+    match_results = sorted(
+        ({**cluster_results[representatives[r.id].id], 'resume_id': r.id} for r in resumes_to_match),
+        key=lambda x: x['match_score'], reverse=True
+    )
     
     # Use background tasks to save results to DB without blocking the HTTP response
-    background_tasks.add_task(save_match_results, match_results, db)
+    background_tasks.add_task(save_match_results, match_results)
     
     # Format the response to include nested resume and job data
     response_results = []
@@ -150,46 +415,114 @@ def bulk_match_resumes(bulk_request: BulkMatchRequest, background_tasks: Backgro
 
     return BulkMatchResponse(results=response_results)
 
-def save_match_results(results: List[dict], db: Session):
-    """Helper function to save match results in the background."""
+async def save_match_results(results: List[dict]):
+    """Helper function to save match results in the background, in a session of its own."""
     match_records = []
     for result in results:
         match_records.append(MatchResult(**result))
     
-    db.add_all(match_records)
-    db.commit()
-    print(f"✅ Successfully saved {len(match_records)} match results to the database.")
+    async with AsyncSessionLocal() as db:
+        db.add_all(match_records)
+        with timed("db_write"):
+            await db.commit()
+    logger.info(f"✅ Successfully saved {len(match_records)} match results to the database.")
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Admin"])
+def get_metrics():
+    """Prometheus-format performance metrics: stage timings, LLM latency and tokens, cache hit rates."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+def require_profile_token(x_profile_token: Optional[str] = Header(None)):
+    if not request_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Request profiling is disabled (set PROFILE_TOKEN).")
+    if not request_profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Profile-Token header.")
+
+@app.get("/admin/profiles", tags=["Admin"], dependencies=[Depends(require_profile_token)])
+def list_profiles():
+    """Stored request profiles, newest first."""
+    return request_profiler.list()
+
+@app.get("/admin/profiles/{profile_id}", tags=["Admin"], dependencies=[Depends(require_profile_token)])
+def get_profile(
+    profile_id: str,
+    format: str = Query("prof", pattern="^(prof|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    limit: int = Query(40, ge=1, le=500),
+):
+    """Downloads a profile as a .prof file (for snakeviz / pstats), or its top functions as text."""
+    path = request_profiler.path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    if format == "text":
+        return PlainTextResponse(request_profiler.summary(path, limit, sort))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+@app.get("/match-results/export", tags=["Matching"])
+async def export_match_results(
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    job_id: Optional[int] = None,
+    min_score: Optional[float] = None
+):
+    """
+    Stream ranked match results joined with candidate and job details as CSV or Parquet.
+    Rows are read from a server-side cursor in chunks, so memory use does not grow with the export size.
+    """
+    suffix = f"_job{job_id}" if job_id else ""
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires the 'pyarrow' package.")
+        return StreamingResponse(
+            stream_parquet(job_id, min_score),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f'attachment; filename="match_results{suffix}.parquet"'}
+        )
+    return StreamingResponse(
+        stream_csv(job_id, min_score),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="match_results{suffix}.csv"'}
+    )
 
 @app.get("/match-results/", response_model=List[MatchResultResponse], tags=["Matching"])
-def get_match_results(job_id: int = None, db: Session = Depends(get_db)):
+async def get_match_results(job_id: int = None, db: AsyncSession = Depends(get_async_db)):
     """Retrieve match results, optionally filtered by job ID."""
-    query = db.query(MatchResult)
+    query = select(MatchResult)
     if job_id:
-        query = query.filter(MatchResult.job_description_id == job_id)
+        query = query.where(MatchResult.job_description_id == job_id)
     
-    results = query.order_by(MatchResult.created_at.desc()).all()
-    return results
+    results = await db.scalars(query.order_by(MatchResult.created_at.desc()))
+    return results.all()
 
 @app.delete("/reset-all-data/", tags=["Admin"])
-def reset_all_data(db: Session = Depends(get_db)):
+async def reset_all_data(db: AsyncSession = Depends(get_async_db)):
     """
     DANGER ZONE: Deletes ALL data from resumes, jobs, and matches tables.
     This is irreversible.
     """
     try:
-        db.execute(delete(MatchResult))
-        db.execute(delete(JobDescription))
-        db.execute(delete(Resume))
+        await db.execute(delete(MatchResult))
+        await db.execute(delete(JobDescription))
+        await db.execute(delete(Resume))
+        await search_index.clear(db)
+        await duplicate_detector.clear(db)
+        await job_index.bump(db)
+        await bump_version(db, feature_store.VERSION_NAME)
         
-        # For SQLite, reset auto-incrementing counters
-        if db.bind.dialect.name == "sqlite":
-            db.execute(text("DELETE FROM sqlite_sequence;"))
+        # For SQLite, reset auto-incrementing counters (the table exists only once an AUTOINCREMENT table does)
+        if async_engine.dialect.name == "sqlite":
+            has_sequence = await db.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'"))
+            if has_sequence.first():
+                await db.execute(text("DELETE FROM sqlite_sequence;"))
 
-        db.commit()
+        await db.commit()
+        feature_store.clear()
+        job_index.clear()
         return JSONResponse(
             status_code=200,
             content={"message": "✅ All data has been successfully reset."}
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error resetting data: {str(e)}")
\ No newline at end of file
@@ -1,12 +1,23 @@
-from typing import Dict, List
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from .llm_service import LLMService
 from .models import Resume, JobDescription
+from .feature_store import CandidateFeatureStore
+from .metrics import timed
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+logger = logging.getLogger(__name__)
+
 class MatchingEngine:
     def __init__(self):
         self.llm_service = LLMService()
+        self.llm_concurrency = int(os.getenv("LLM_CONCURRENCY", 8))
+        # Reverse matching only spends an LLM call on pairs whose rule-based score (0-1) reaches this
+        self.escalation_threshold = float(os.getenv("REVERSE_MATCH_LLM_THRESHOLD", 0.6))
     
     def calculate_skill_score(self, resume_skills: List[str], job_skills: List[str]) -> float:
         """Calculate skill similarity using TF-IDF and cosine similarity."""
@@ -33,69 +44,170 @@ class MatchingEngine:
         if resume_exp <= 0: return 0.0
         return min(1.0, resume_exp / job_exp)
     
+    def _rule_scores(self, resume: Resume, job: JobDescription) -> Dict:
+        """Rule-based scoring (serves as a baseline and input for the final score)."""
+        with timed("rule_scoring"):
+            skill_score = self.calculate_skill_score(resume.skills, job.required_skills)
+            exp_score = self.calculate_experience_score(resume.experience, job.required_experience)
+        return {
+            "skill_score": skill_score,
+            "exp_score": exp_score,
+            "rule_based_score": (skill_score * 0.7) + (exp_score * 0.3),
+        }
+
+    def _combine(self, resume: Resume, rules: Dict, llm_result: Dict) -> Dict:
+        """Combine scores: 60% LLM, 40% rule-based."""
+        llm_score = llm_result['match_score'] / 10.0  # Normalize to 0-1 scale
+        final_score = (llm_score * 0.6) + (rules['rule_based_score'] * 0.4)
+        return {
+            "match_score": round(final_score * 10, 1),
+            **llm_result  # Unpack summary, strengths, gaps, is_student
+        }
+
+    def _rule_only_result(self, resume: Resume, rules: Dict, error: Exception) -> Dict:
+        logger.warning(f"❌ LLM matching failed, falling back to rule-based only: {error}")
+        # Fallback to a response based purely on rules
+        return {
+            "match_score": round(rules['rule_based_score'] * 10, 1),
+            "summary": "AI analysis failed. This result is based on a keyword and experience match only.",
+            "strengths": [f"Skill match score: {rules['skill_score']:.2f}", f"Experience match score: {rules['exp_score']:.2f}"],
+            "gaps": ["Detailed AI analysis is unavailable."],
+            "is_student": resume.experience < 2
+        }
+
     def hybrid_match(self, resume: Resume, job: JobDescription) -> Dict:
         """Perform hybrid matching (rule-based + LLM) for a single resume."""
-        
-        # 1. Rule-based scoring (serves as a baseline and input for the final score)
-        skill_score = self.calculate_skill_score(resume.skills, job.required_skills)
-        exp_score = self.calculate_experience_score(resume.experience, job.required_experience)
-        rule_based_score = (skill_score * 0.7) + (exp_score * 0.3)
-        
-        # 2. LLM-based analysis
+        rules = self._rule_scores(resume, job)
         try:
             llm_result = self.llm_service.match_resume_job(resume.dict(), job.dict())
-            llm_score = llm_result['match_score'] / 10.0  # Normalize to 0-1 scale
-            
-            # 3. Combine scores: 60% LLM, 40% rule-based
-            final_score = (llm_score * 0.6) + (rule_based_score * 0.4)
-            
-            result = {
-                "match_score": round(final_score * 10, 1),
-                **llm_result  # Unpack summary, strengths, gaps, is_student
-            }
-            
+            return self._combine(resume, rules, llm_result)
         except Exception as e:
-            print(f"❌ LLM matching failed, falling back to rule-based only: {e}")
-            # Fallback to a response based purely on rules
-            result = {
-                "match_score": round(rule_based_score * 10, 1),
-                "summary": "AI analysis failed. This result is based on a keyword and experience match only.",
-                "strengths": [f"Skill match score: {skill_score:.2f}", f"Experience match score: {exp_score:.2f}"],
-                "gaps": ["Detailed AI analysis is unavailable."],
-                "is_student": resume.experience < 2
-            }
-        
-        return result
+            return self._rule_only_result(resume, rules, e)
+
+    async def ahybrid_match(self, resume: Resume, job: JobDescription, rules: Optional[Dict] = None) -> Dict:
+        """Async hybrid matching; the LLM call does not block the event loop."""
+        rules = rules or self._rule_scores(resume, job)
+        try:
+            llm_result = await self.llm_service.amatch_resume_job(resume.dict(), job.dict())
+            return self._combine(resume, rules, llm_result)
+        except Exception as e:
+            return self._rule_only_result(resume, rules, e)
+
+    @staticmethod
+    def _db_result(resume: Resume, job: JobDescription, match_result: Dict) -> Dict:
+        """Prepare result for database insertion."""
+        return {
+            'resume_id': resume.id,
+            'job_description_id': job.id,
+            'match_score': match_result['match_score'],
+            'summary': match_result['summary'],
+            'strengths': match_result['strengths'],
+            'gaps': match_result['gaps'],
+        }
+
+    @staticmethod
+    def _error_result(resume: Resume, job: JobDescription, error: Exception) -> Dict:
+        logger.error(f"❌ Error matching resume ID {resume.id}: {error}")
+        return {
+            'resume_id': resume.id,
+            'job_description_id': job.id,
+            'match_score': 0.0,
+            'summary': f"A critical error occurred during matching: {error}",
+            'strengths': [],
+            'gaps': ["Matching process failed for this candidate."],
+        }
 
     def bulk_match(self, resumes: List[Resume], job: JobDescription) -> List[Dict]:
         """Match multiple resumes efficiently."""
         results = []
         for resume in resumes:
             try:
-                match_result = self.hybrid_match(resume, job)
-                
-                # Prepare result for database insertion
-                db_result = {
-                    'resume_id': resume.id,
-                    'job_description_id': job.id,
-                    'match_score': match_result['match_score'],
-                    'summary': match_result['summary'],
-                    'strengths': match_result['strengths'],
-                    'gaps': match_result['gaps'],
-                }
-                results.append(db_result)
-
+                results.append(self._db_result(resume, job, self.hybrid_match(resume, job)))
             except Exception as e:
-                print(f"❌ Error matching resume ID {resume.id}: {e}")
-                results.append({
-                    'resume_id': resume.id,
-                    'job_description_id': job.id,
-                    'match_score': 0.0,
-                    'summary': f"A critical error occurred during matching: {e}",
-                    'strengths': [],
-                    'gaps': ["Matching process failed for this candidate."],
-                })
+                results.append(self._error_result(resume, job, e))
         
         # Sort results by score, descending
         results.sort(key=lambda x: x['match_score'], reverse=True)
-        return results
\ No newline at end of file
+        return results
+
+    async def abulk_match(self, resumes: List[Resume], job: JobDescription) -> List[Dict]:
+        """
+        Async bulk matching. Rule-based scoring runs in a worker thread, then up to
+        LLM_CONCURRENCY LLM calls are in flight at once.
+        """
+        rules_by_id = await asyncio.to_thread(lambda: {r.id: self._rule_scores(r, job) for r in resumes})
+        semaphore = asyncio.Semaphore(self.llm_concurrency)
+
+        async def match_one(resume: Resume) -> Dict:
+            async with semaphore:
+                try:
+                    match_result = await self.ahybrid_match(resume, job, rules_by_id[resume.id])
+                    return self._db_result(resume, job, match_result)
+                except Exception as e:
+                    return self._error_result(resume, job, e)
+
+        results = list(await asyncio.gather(*(match_one(r) for r in resumes)))
+        results.sort(key=lambda x: x['match_score'], reverse=True)
+        return results
+
+    async def aanalyze(self, resume: Resume, job: JobDescription) -> Dict:
+        """Single hybrid match where either side may be unsaved (ids are then None); keeps the rule-based score."""
+        rules = self._rule_scores(resume, job)
+        match_result = await self.ahybrid_match(resume, job, rules)
+        return {**self._db_result(resume, job, match_result), 'rule_based_score': round(rules['rule_based_score'], 4)}
+
+    @staticmethod
+    def _prescreen_result(rules: Dict) -> Dict:
+        return {
+            "match_score": round(rules['rule_based_score'] * 10, 1),
+            "summary": "Rule-based pre-screen only: below the threshold for AI analysis.",
+            "strengths": [f"Skill match score: {rules['skill_score']:.2f}", f"Experience match score: {rules['exp_score']:.2f}"],
+            "gaps": [],
+        }
+
+    async def amatch_jobs(self, resume: Resume, ranked_jobs: List[Tuple[JobDescription, Dict]], stored: Optional[Dict[int, Dict]] = None) -> List[Dict]:
+        """
+        Reverse matching for one resume against its pre-ranked jobs. Only pairs whose rule-based
+        score reaches REVERSE_MATCH_LLM_THRESHOLD are escalated to the LLM, and pairs that already
+        have a stored result (stored, by job id) reuse it instead (marked 'reused').
+        """
+        semaphore = asyncio.Semaphore(self.llm_concurrency)
+        stored = stored or {}
+
+        async def match_one(job: JobDescription, rules: Dict) -> Dict:
+            escalated = rules['rule_based_score'] >= self.escalation_threshold
+            reused = escalated and job.id in stored
+            if reused:
+                match_result = stored[job.id]
+            elif escalated:
+                async with semaphore:
+                    match_result = await self.ahybrid_match(resume, job, rules)
+            else:
+                match_result = self._prescreen_result(rules)
+            return {
+                **self._db_result(resume, job, match_result),
+                'rule_based_score': round(rules['rule_based_score'], 4),
+                'escalated': escalated,
+                'reused': reused,
+            }
+
+        results = list(await asyncio.gather(*(match_one(job, rules) for job, rules in ranked_jobs)))
+        results.sort(key=lambda x: x['match_score'], reverse=True)
+        return results
+
+    def rank_candidates(self, job: JobDescription, store: CandidateFeatureStore, top_k: int, include_duplicates: bool = False) -> List[Dict]:
+        """Rule-based ranking of every candidate in the feature store for a job, without touching the database."""
+        with timed("candidate_ranking"):
+            ids, canonical, skill, exp, rule = store.score(job.required_skills, job.required_experience)
+            rows = np.arange(len(ids)) if include_duplicates else np.flatnonzero(canonical == 0)
+            k = min(top_k, len(rows))
+            if k == 0:
+                return []
+            top = rows[np.argpartition(-rule[rows], k - 1)[:k]]
+            top = top[np.argsort(-rule[top], kind="stable")]
+        return [{
+            "resume_id": int(ids[i]),
+            "skill_score": round(float(skill[i]), 4),
+            "exp_score": round(float(exp[i]), 4),
+            "rule_based_score": round(float(rule[i]), 4),
+        } for i in top]
\ No newline at end of file
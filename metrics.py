@@ -0,0 +1,189 @@
+"""
+Process-local performance metrics rendered in the Prometheus text exposition format.
+
+Kept dependency-free on purpose: observations are a dict update under a lock, so they are
+cheap enough for the parsing and matching hot loops.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# When set (inside parser worker processes), observations are collected here and shipped
+# back to the API process instead of being recorded in the worker's own registry.
+_capture_sink: Optional[List[Tuple[str, Tuple, float]]] = None
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value:g}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """A gauge whose samples are read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), callback: Callable = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        samples = self.callback() if self.callback else {}
+        if not isinstance(samples, dict):
+            samples = {(): samples}
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {float(value):g}" for key, value in samples.items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        if _capture_sink is not None:
+            _capture_sink.append((self.name, key, value))
+            return
+        self._observe_key(key, value)
+
+    def _observe_key(self, key: Tuple, value: float):
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self, **labels) -> Optional[Dict]:
+        series = self._series.get(self._key(labels))
+        if series is None:
+            return None
+        return {"count": series[-1], "sum": series[-2]}
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labelnames, key, 'le="%g"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "resume_screener_stage_seconds", "Time spent in each processing stage.", ("stage",)))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "resume_screener_llm_request_seconds", "LLM completion latency.", ("provider",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)))
+LLM_REQUESTS = REGISTRY.register(Counter(
+    "resume_screener_llm_requests_total", "LLM completions by outcome.", ("provider", "outcome")))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "resume_screener_llm_tokens_total", "LLM tokens consumed.", ("provider", "kind")))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "resume_screener_cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result")))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "resume_screener_http_request_seconds", "API request latency.", ("method", "route", "status")))
+
+
+@contextmanager
+def timed(stage: str):
+    """Records the wall time of the enclosed block under the given stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+@contextmanager
+def capture():
+    """Collects histogram observations made in this process (used by parser workers)."""
+    global _capture_sink
+    sink: List[Tuple[str, Tuple, float]] = []
+    _capture_sink = sink
+    try:
+        yield sink
+    finally:
+        _capture_sink = None
+
+
+def replay(observations: List[Tuple[str, Tuple, float]]):
+    """Records observations captured in another process into this process's registry."""
+    for name, key, value in observations:
+        metric = REGISTRY.get(name)
+        if isinstance(metric, Histogram):
+            metric._observe_key(key, value)
\ No newline at end of file
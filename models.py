@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, Text
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, JSON, DateTime, Text, LargeBinary, Index, true
+from sqlalchemy.orm import declarative_base, deferred
 from sqlalchemy.sql import func
+from .compression import CompressedText, CompressedJSON
 
 Base = declarative_base()
 
@@ -10,17 +11,46 @@ class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, unique=True, index=True, nullable=False)
     name = Column(String)
-    email = Column(String, unique=True, index=True)
+    email = Column(String, index=True) # Not unique: re-uploads of a candidate are clustered via canonical_id
     phone = Column(String, nullable=True)
     skills = Column(JSON)
     experience = Column(Float)
     education = Column(JSON)
-    raw_text = Column(Text)
+    raw_text = deferred(Column(CompressedText)) # Compressed; only loaded when a query asks for it (undefer)
+    digest = Column(Text, nullable=True) # Compact, prompt-ready candidate summary built at parse time
+    minhash = Column(LargeBinary, nullable=True) # MinHash signature of raw_text for near-duplicate detection
+    canonical_id = Column(Integer, index=True, nullable=True) # Set when this resume duplicates an earlier candidate
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     def dict(self):
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
 
+class LSHBucket(Base):
+    """One row per (resume, LSH band): resumes sharing a bucket are near-duplicate candidates."""
+    __tablename__ = "resume_lsh_buckets"
+    
+    id = Column(Integer, primary_key=True)
+    band = Column(Integer, nullable=False)
+    bucket = Column(BigInteger, nullable=False)
+    resume_id = Column(Integer, index=True, nullable=False)
+
+    __table_args__ = (Index("ix_resume_lsh_buckets_band_bucket", "band", "bucket"),)
+
+class DataVersion(Base):
+    """Counters bumped in the same transaction as a change, so every API process can tell when a cache is stale."""
+    __tablename__ = "data_versions"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class CompressionDictionary(Base):
+    """zstd dictionaries referenced by id from compressed column values; never deleted."""
+    __tablename__ = "compression_dictionaries"
+    
+    id = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
     
@@ -30,6 +60,7 @@ class JobDescription(Base):
     required_skills = Column(JSON)
     required_experience = Column(Float)
     required_education = Column(String, nullable=True)
+    is_open = Column(Boolean, nullable=False, default=True, server_default=true()) # Closed jobs are skipped by reverse matching
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     def dict(self):
@@ -42,7 +73,7 @@ class MatchResult(Base):
     resume_id = Column(Integer, index=True)
     job_description_id = Column(Integer, index=True)
     match_score = Column(Float)
-    summary = Column(Text) # Changed from justification
-    strengths = Column(JSON)
-    gaps = Column(JSON)
+    summary = Column(CompressedText) # Changed from justification
+    strengths = Column(CompressedJSON)
+    gaps = Column(CompressedJSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -0,0 +1,75 @@
+import asyncio
+import contextvars
+import functools
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from . import metrics
+from .cache import LRUCache
+from .log_config import configure_logging
+from .pdf_parser import ResumeParser
+
+# Each worker process loads its own spaCy model once, at start-up
+_worker_parser: Optional[ResumeParser] = None
+
+def _init_worker():
+    global _worker_parser
+    configure_logging()
+    _worker_parser = ResumeParser()
+
+def _parse_in_worker(data: bytes, filename: str) -> Tuple[Dict, list]:
+    # Stage timings are shipped back so they show up in the API process's /metrics
+    with metrics.capture() as observations:
+        result = _worker_parser.parse_resume_bytes(data, filename)
+    return result, observations
+
+
+class ParsePool:
+    """
+    Runs CPU-bound PDF parsing off the event loop.
+
+    PARSER_WORKERS > 0 uses that many worker processes, so large parses do not hold
+    the GIL of the process serving requests. PARSER_WORKERS=0 parses in a thread
+    with the given in-process parser (handy for development and debugging).
+
+    Successful results are cached by a hash of the PDF bytes (PARSE_CACHE_SIZE entries), so
+    re-submitting the same file, e.g. to analyze it against another job, skips the parse.
+    """
+
+    def __init__(self, parser: ResumeParser, max_workers: Optional[int] = None):
+        self.parser = parser
+        self.max_workers = int(os.getenv("PARSER_WORKERS", 2)) if max_workers is None else max_workers
+        if self.max_workers > 0:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="resume-parser")
+        self.cache = LRUCache("parse", maxsize=int(os.getenv("PARSE_CACHE_SIZE", 256)))
+
+    async def parse(self, data: bytes, filename: str) -> Dict:
+        key = hashlib.sha256(data).digest()
+        result = self.cache.get(key)
+        if result is None:
+            result = await self._parse(data, filename)
+            if result.get('name') != 'Parsing Failed':
+                self.cache.put(key, result)
+        return dict(result)  # Callers get their own copy of the cached dict
+
+    async def _parse(self, data: bytes, filename: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        if self.max_workers > 0:
+            result, observations = await loop.run_in_executor(self.executor, _parse_in_worker, data, filename)
+            metrics.replay(observations)
+            return result
+        # Run in a copy of the caller's context, as asyncio.to_thread does, so request profiles see the parse
+        parse = functools.partial(contextvars.copy_context().run, self.parser.parse_resume_bytes, data, filename)
+        return await loop.run_in_executor(self.executor, parse)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
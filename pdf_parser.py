@@ -1,9 +1,16 @@
+import logging
+import io
 import pdfplumber
 import re
 import spacy
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import os
+from .prompt_builder import PromptBuilder
+from .metrics import timed
+from .dedup import minhash_signature
+
+logger = logging.getLogger(__name__)
 
 class ResumeParser:
     def __init__(self):
@@ -12,6 +19,8 @@ class ResumeParser:
         except OSError:
             raise Exception("Spacy model 'en_core_web_sm' not found. Please run: python -m spacy download en_core_web_sm")
 
+        self.prompt_builder = PromptBuilder()
+
         self.skills_db = {
             'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'typescript'],
             'web': ['html', 'css', 'react', 'angular', 'vue', 'django', 'flask', 'node.js', 'express', 'spring', 'laravel'],
@@ -22,7 +31,8 @@ class ResumeParser:
             'soft_skills': ['leadership', 'communication', 'teamwork', 'problem solving', 'project management', 'agile']
         }
 
-    def extract_text_from_pdf(self, file_path: str) -> str:
+    def extract_text_from_pdf(self, file_path) -> str:
+        """Accepts a filesystem path or a binary file-like object."""
         text = ""
         try:
             with pdfplumber.open(file_path) as pdf:
@@ -156,9 +166,15 @@ class ResumeParser:
         evidence.sort(key=lambda x: (x['confidence'], x['value']), reverse=True)
         best_evidence = evidence[0]
         
-        print(f"✅ Experience Analysis: Best evidence is {best_evidence['value']:.1f} years (source: {best_evidence['source']})")
+        logger.debug("✅ Experience Analysis: Best evidence is %.1f years (source: %s)", best_evidence['value'], best_evidence['source'])
         return round(best_evidence['value'], 1)
 
+    def extract_required_experience(self, text: str) -> float:
+        """Years asked for by a free-text job description ("5+ years", "3-5 years"); the largest lower bound wins."""
+        matches = re.findall(r'(\d+\.?\d*)\s*(?:\+|(?:-|to)\s*\d+\.?\d*)?\s*\+?\s*(?:years?|yrs?)\b', text.lower())
+        years = [float(value) for value in matches if 0 < float(value) < 40]
+        return max(years) if years else 0.0
+
     def extract_education(self, text: str) -> List[str]:
         education_text = self.extract_sections(text).get('education', text)
         sentences = re.split(r'\.\s+', education_text)
@@ -170,25 +186,46 @@ class ResumeParser:
         return education_entries[:3]
 
     def parse_resume(self, file_path: str) -> Dict:
+        return self._parse(file_path, os.path.basename(file_path))
+
+    def parse_resume_bytes(self, data: bytes, filename: str) -> Dict:
+        """Parses an in-memory PDF, avoiding a round trip through the filesystem."""
+        return self._parse(io.BytesIO(data), filename)
+
+    def _parse(self, source, filename: str) -> Dict:
         try:
-            raw_text = self.extract_text_from_pdf(file_path)
+            with timed("pdf_extraction"):
+                raw_text = self.extract_text_from_pdf(source)
             if not raw_text:
                 raise ValueError("PDF text extraction returned empty.")
             
-            clean_text = self.clean_text(raw_text)
             contact_info = self.extract_contact_info(raw_text)
+            with timed("skill_extraction"):
+                skills = self.extract_skills(raw_text)
+            with timed("ner"):
+                name = self.extract_name(raw_text)
+            with timed("experience_extraction"):
+                experience = self.extract_experience(raw_text)
+            with timed("education_extraction"):
+                education = self.extract_education(raw_text)
+            with timed("digest"):
+                digest = self.prompt_builder.build_digest(raw_text, self.extract_sections(raw_text), skills)
+            with timed("minhash"):
+                minhash = minhash_signature(raw_text)
             
             result = {
-                'name': self.extract_name(raw_text),
+                'name': name,
                 'email': contact_info['email'],
                 'phone': contact_info['phone'],
-                'skills': self.extract_skills(raw_text),
-                'experience': self.extract_experience(raw_text),
-                'education': self.extract_education(raw_text),
-                'raw_text': raw_text
+                'skills': skills,
+                'experience': experience,
+                'education': education,
+                'raw_text': raw_text,
+                'digest': digest,
+                'minhash': minhash
             }
-            print(f"✅ Parsed: {result['name']} | Exp: {result['experience']} yrs | Skills: {len(result['skills'])}")
+            logger.info("✅ Parsed: %s | Exp: %s yrs | Skills: %d", result['name'], result['experience'], len(result['skills']))
             return result
         except Exception as e:
-            print(f"❌ Critical parsing error for {os.path.basename(file_path)}: {e}")
-            return {'name': 'Parsing Failed', 'email': None, 'phone': None, 'skills': [], 'experience': 0.0, 'education': [], 'raw_text': ''}
\ No newline at end of file
+            logger.error(f"❌ Critical parsing error for {filename}: {e}")
+            return {'name': 'Parsing Failed', 'email': None, 'phone': None, 'skills': [], 'experience': 0.0, 'education': [], 'raw_text': '', 'digest': '', 'minhash': None}
\ No newline at end of file
@@ -0,0 +1,268 @@
+import asyncio
+import contextvars
+import hmac
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_PATTERN = re.compile(r"[0-9]{8}T[0-9]{6}-[0-9a-f]{8}")
+
+# The sampler of the request being profiled. Tasks spawned by the request and the work it hands to
+# asyncio.to_thread or Starlette's threadpool run in copies of its context, which is how the
+# sampler tells the request's stacks apart from everyone else's.
+_SAMPLER: contextvars.ContextVar[Optional["StackSampler"]] = contextvars.ContextVar("request_profile", default=None)
+
+FrameKey = Tuple[str, int, str]
+
+
+def _frame_context(frame) -> Optional[contextvars.Context]:
+    """
+    The contextvars.Context a frame runs its callee in, for the frames that start one. Event-loop work
+    is found through asyncio's pure-Python Handle._run, so loops with C handles (uvloop) are not covered.
+    """
+    if frame.f_code.co_name not in ("_run", "run"):  # skip f_locals for everything else, it is not free
+        return None
+    local_vars = frame.f_locals
+    owner = local_vars.get("self")
+    if isinstance(owner, asyncio.Handle):  # one step of a task, or a callback, on the event loop
+        return owner._context
+    if isinstance(owner, threading.Thread):  # anyio's worker threads, which run Starlette's threadpool
+        context = local_vars.get("context")
+    else:  # a concurrent.futures work item running partial(context.run, ...), as asyncio.to_thread submits
+        context = getattr(getattr(getattr(owner, "fn", None), "func", None), "__self__", None)
+    return context if isinstance(context, contextvars.Context) else None
+
+
+class StackSampler:
+    """
+    Statistical profiler for one request. A background thread wakes every interval seconds and
+    records the stack of each thread that is currently running in the request's context: the event
+    loop only while one of the request's tasks is being stepped, and pool threads only while they
+    execute work submitted by the request. Concurrent requests never land in the profile.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()  # stack -> number of samples
+        self.seconds: Counter = Counter()  # stack -> wall time those samples stand for
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        # The sampler needs the GIL to look at other threads; by default a busy thread keeps it for up
+        # to 5 ms, so hand it over at the sampling rate meanwhile. This is process-wide: every
+        # concurrent request pays for the extra switches until the profile ends.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # A busy thread can hold the GIL for a whole switch interval, so weigh each sample by the
+            # time since the previous one rather than by the nominal interval
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    stack = self._owned_stack(frame)
+                    if stack:
+                        self.samples[stack] += 1
+                        self.seconds[stack] += elapsed
+
+    def _owned_stack(self, frame) -> Optional[Tuple[FrameKey, ...]]:
+        """The stack above the innermost context boundary, innermost first, if that context is ours."""
+        stack = []
+        while frame is not None:
+            context = _frame_context(frame)
+            if context is not None:
+                return tuple(stack) if context.get(_SAMPLER) is self else None
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        return None
+
+    def stats(self) -> Dict:
+        """The samples in pstats' marshalled form; call counts are sample counts, times are sampled."""
+        stats: Dict = {}
+        for stack, count in self.samples.items():
+            elapsed = self.seconds[stack]
+            seen = set()
+            for depth, key in enumerate(stack):
+                calls, _, own, cumulative, callers = stats.get(key, (0, 0, 0.0, 0.0, {}))
+                if depth == 0:
+                    own += elapsed
+                if key not in seen:  # recursion must not count the same sample twice
+                    seen.add(key)
+                    calls += count
+                    cumulative += elapsed
+                    if depth + 1 < len(stack):
+                        caller = stack[depth + 1]
+                        c_calls, _, c_own, c_cumulative = callers.get(caller, (0, 0, 0.0, 0.0))
+                        callers[caller] = (c_calls + count, c_calls + count,
+                                           c_own + (elapsed if depth == 0 else 0.0), c_cumulative + elapsed)
+                stats[key] = (calls, calls, own, cumulative, callers)
+        return stats
+
+
+class RequestProfiler:
+    """
+    Opt-in sampling profiles of single API requests. A request is profiled only when it carries
+    PROFILE_TOKEN in the X-Profile-Token header, passes PROFILE_SAMPLE_RATE, and no other profile
+    is running. Each capture is saved to PROFILE_DIR as <id>.prof (pstats format) plus a small
+    <id>.json description; only the newest PROFILE_MAX_FILES are kept.
+    """
+
+    def __init__(self):
+        self.token = os.getenv("PROFILE_TOKEN", "")
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", 1.0))
+        self.interval = float(os.getenv("PROFILE_INTERVAL_MS", 1.0)) / 1000.0
+        self.directory = os.getenv("PROFILE_DIR", "profiles")
+        self.max_files = int(os.getenv("PROFILE_MAX_FILES", 50))
+        # One sampler thread at a time keeps the cost of profiling bounded under load
+        self._lock = threading.Lock()
+        self._warned_loop = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        return self.enabled and token is not None and hmac.compare_digest(token, self.token)
+
+    def requested(self, scope) -> bool:
+        if scope["type"] != "http" or scope["path"].startswith("/admin/profiles"):  # admin calls carry the token too
+            return False
+        for name, value in scope["headers"]:
+            if name == b"x-profile-token":
+                return self.authorized(value.decode("latin-1")) and random.random() < self.sample_rate
+        return False
+
+    def _loop_sampled(self) -> bool:
+        """Whether the running event loop's work can be attributed (asyncio's own loops, not uvloop)."""
+        loop = asyncio.get_running_loop()
+        if isinstance(loop, asyncio.BaseEventLoop):
+            return True
+        if not self._warned_loop:
+            self._warned_loop = True
+            logger.warning(f"Request profiles cannot see work on the {type(loop).__module__}.{type(loop).__name__} event loop, "
+                           "only worker threads are sampled; run uvicorn with --loop asyncio to profile async endpoints.")
+        return False
+
+    async def profile(self, app, scope, receive, send):
+        if not self._lock.acquire(blocking=False):
+            return await app(scope, receive, _with_header(send, b"x-profile-skipped", b"busy", {}))
+        try:
+            loop_sampled = self._loop_sampled()
+            profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+            response = {}
+            sampler = StackSampler(self.interval)
+            token = _SAMPLER.set(sampler)
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                await app(scope, receive, _with_header(send, b"x-profile-id", profile_id.encode(), response))
+            finally:
+                sampler.stop()
+                _SAMPLER.reset(token)
+                self.save(profile_id, sampler, {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": response.get("status", 500),
+                    "duration_ms": round((time.perf_counter() - started) * 1000.0, 2),
+                    "samples": sum(sampler.samples.values()),
+                    "sampled_ms": round(sum(sampler.seconds.values()) * 1000.0, 2),
+                    "event_loop_sampled": loop_sampled,
+                })
+        finally:
+            self._lock.release()
+
+    def save(self, profile_id: str, sampler: StackSampler, info: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f"{profile_id}.prof"), "wb") as f:
+            marshal.dump(sampler.stats(), f)
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+            json.dump({"id": profile_id, "created_at": datetime.now(timezone.utc).isoformat(), **info}, f)
+        logger.info(f"Saved profile {profile_id} for {info['method']} {info['path']} ({info['duration_ms']} ms).")
+        self._prune()
+
+    def _prune(self):
+        for profile_id in [p["id"] for p in self.list()][self.max_files:]:
+            for extension in (".prof", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + extension))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict]:
+        """Stored profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+        return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+    def path(self, profile_id: str) -> Optional[str]:
+        if not PROFILE_ID_PATTERN.fullmatch(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    @staticmethod
+    def summary(path: str, limit: int = 40, sort: str = "cumulative") -> str:
+        """The top functions of a stored profile, as pstats prints them."""
+        with open(path, "rb") as f:
+            if not marshal.load(f):  # pstats refuses an empty profile
+                return "No samples: the request finished within one sampling interval.\n"
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+def _with_header(send, name: bytes, value: bytes, response: Dict):
+    """Wraps an ASGI send so the response start gets one more header; its status lands in response."""
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            message = {**message, "headers": [*message.get("headers", []), (name, value)]}
+        await send(message)
+    return wrapped
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware: a request without the profile header is handed straight to the app, with
+    no extra task, response wrapper or body buffering.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.requested(scope):
+            return await self.app(scope, receive, send)
+        await self.profiler.profile(self.app, scope, receive, send)
\ No newline at end of file
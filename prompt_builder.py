@@ -0,0 +1,143 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .cache import LRUCache
+
+# Relevance prior for each resume section when building the job-agnostic digest
+SECTION_WEIGHTS = {'header': 2.0, 'experience': 3.0, 'education': 1.0, 'other': 1.0}
+
+CONTACT_PATTERN = re.compile(r'@|https?://|www\.|linkedin|github\.com')
+PHONE_PATTERN = re.compile(r'\+?\d[\d\s().-]{8,}\d')
+YEAR_RANGE_PATTERN = re.compile(r'\b(?:19|20)\d{2}\s*[-–]\s*(?:(?:19|20)\d{2}|present)\b', re.IGNORECASE)
+EVIDENCE_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b|\d+\+?\s*(?:years?|yrs?|%|x\b)', re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r'(?<=[.;!?])\s+|\s+[•▪●◦·]\s*')
+MAX_CHUNK_CHARS = 240
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)."""
+    return (len(text) + 3) // 4
+
+
+def is_contact_line(chunk: str) -> bool:
+    """Email, profile links or a phone number; employment date ranges like "2015 - 2018" are not phones."""
+    if CONTACT_PATTERN.search(chunk):
+        return True
+    candidates = PHONE_PATTERN.findall(YEAR_RANGE_PATTERN.sub(' ', chunk))
+    return any(sum(c.isdigit() for c in candidate) >= 10 for candidate in candidates)
+
+
+def _skill_patterns(skills: Tuple[str, ...]) -> List[re.Pattern]:
+    return [re.compile(r'\b' + re.escape(s.lower()) + r'\b') for s in skills if s]
+
+
+class PromptBuilder:
+    """
+    Compacts resume and job text into the most relevant chunks under a token budget.
+
+    A job-agnostic digest is built once per resume at parse time and stored with it.
+    At prompt time the digest lines are re-ranked against the job's required skills
+    and trimmed to the prompt budget, so no full-text reflow happens per call.
+    """
+
+    def __init__(self, digest_budget: Optional[int] = None, resume_budget: Optional[int] = None, job_budget: Optional[int] = None):
+        self.digest_budget = int(digest_budget or os.getenv("DIGEST_TOKEN_BUDGET", 400))
+        self.resume_budget = int(resume_budget or os.getenv("PROMPT_RESUME_TOKEN_BUDGET", 160))
+        self.job_budget = int(job_budget or os.getenv("PROMPT_JOB_TOKEN_BUDGET", 120))
+        self._legacy_digests = LRUCache("legacy_digest", maxsize=1024)
+        self._job_details = LRUCache("job_details", maxsize=256)
+
+    def _segment(self, text: str) -> List[str]:
+        """Splits text into short, whitespace-normalized chunks (lines, then sentences)."""
+        lines = []
+        for line in text.splitlines():
+            line = re.sub(r'\s+', ' ', line).strip()
+            if lines and line[:1].islower():
+                lines[-1] += ' ' + line  # Re-join a sentence that the PDF layout wrapped
+            elif line:
+                lines.append(line)
+
+        chunks = []
+        for line in lines:
+            if len(line) < 3:
+                continue
+            for piece in SENTENCE_SPLIT.split(line) if len(line) > MAX_CHUNK_CHARS else [line]:
+                piece = piece.strip()
+                while len(piece) > MAX_CHUNK_CHARS:
+                    cut = piece.rfind(' ', 0, MAX_CHUNK_CHARS)
+                    cut = cut if cut > 0 else MAX_CHUNK_CHARS
+                    chunks.append(piece[:cut])
+                    piece = piece[cut:].strip()
+                if len(piece) >= 3:
+                    chunks.append(piece)
+        return chunks
+
+    def _split_by_section(self, raw_text: str, sections: Dict[str, str]) -> List[Tuple[str, str]]:
+        """Tags each chunk of the resume with the parser section it belongs to."""
+        spans = sorted(
+            (raw_text.find(body), name) for name, body in sections.items() if body and raw_text.find(body) >= 0
+        )
+        boundaries = [(0, 'header')] + spans
+        tagged = []
+        for i, (start, name) in enumerate(boundaries):
+            end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(raw_text)
+            section = name if name in SECTION_WEIGHTS else 'other'
+            tagged.extend((section, chunk) for chunk in self._segment(raw_text[start:end]))
+        return tagged
+
+    @staticmethod
+    def _select(chunks: List[Tuple[float, str]], budget: int, keep_first: bool = False) -> List[str]:
+        """Greedily keeps the highest-scoring chunks that fit the budget, in original order."""
+        order = sorted(range(len(chunks)), key=lambda i: (-chunks[i][0], i))
+        if keep_first and chunks:
+            order.remove(0)
+            order.insert(0, 0)
+        chosen, used = [], 0
+        for i in order:
+            cost = estimate_tokens(chunks[i][1]) + 1
+            if used + cost > budget:
+                continue
+            chosen.append(i)
+            used += cost
+        return [chunks[i][1] for i in sorted(chosen)]
+
+    def build_digest(self, raw_text: str, sections: Dict[str, str], skills: List[str]) -> str:
+        """Builds the compact, job-agnostic candidate digest stored alongside the resume."""
+        patterns = _skill_patterns(tuple(skills))
+        scored = []
+        for section, chunk in self._split_by_section(raw_text, sections):
+            if len(chunk) < 80 and is_contact_line(chunk):
+                continue  # Contact details carry no signal for the model
+            lower = chunk.lower()
+            score = SECTION_WEIGHTS[section]
+            score += 2.0 * sum(1 for p in patterns if p.search(lower))
+            score += 1.0 if EVIDENCE_PATTERN.search(chunk) else 0.0
+            scored.append((score, chunk))
+        return '\n'.join(self._select(scored, self.digest_budget, keep_first=True))
+
+    def resume_snippet(self, resume_data: Dict, required_skills: List[str]) -> str:
+        """Picks the digest lines most relevant to the job's required skills under the prompt budget."""
+        digest = resume_data.get('digest')
+        if not digest:
+            raw_text = resume_data.get('raw_text') or ''
+            digest = self._legacy_digests.get_or_compute(raw_text, lambda: self.build_digest(raw_text, {}, []))
+        lines = digest.split('\n') if digest else []
+        patterns = _skill_patterns(tuple(required_skills))
+        scored = [(float(sum(1 for p in patterns if p.search(line.lower()))), line) for line in lines]
+        return ' | '.join(self._select(scored, self.resume_budget, keep_first=True))
+
+    def _compact_job_details(self, description: str, required_skills: Tuple[str, ...]) -> str:
+        patterns = _skill_patterns(required_skills)
+        scored = []
+        for chunk in self._segment(description):
+            lower = chunk.lower()
+            score = 2.0 * sum(1 for p in patterns if p.search(lower))
+            score += 1.0 if 'experience' in lower or EVIDENCE_PATTERN.search(chunk) else 0.0
+            scored.append((score, chunk))
+        return ' '.join(self._select(scored, self.job_budget, keep_first=True))
+
+    def job_details(self, job_description: Dict) -> str:
+        """Compacts the job description text, keeping requirement-bearing sentences."""
+        key = (job_description.get('description') or '', tuple(job_description.get('required_skills') or []))
+        return self._job_details.get_or_compute(key, lambda: self._compact_job_details(*key))
\ No newline at end of file
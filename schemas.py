@@ -2,13 +2,15 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-class ResumeBase(BaseModel):
+class ResumeProfile(BaseModel):
     name: str = Field(..., example="Jane Doe")
     email: Optional[str] = Field(None, example="jane.doe@example.com")
     phone: Optional[str] = Field(None, example="+14155552671")
     skills: List[str] = Field(default=[], example=["Python", "FastAPI", "SQL"])
     experience: float = Field(..., example=5.5)
     education: List[str] = Field(default=[], example=["B.S. in Computer Science"])
+
+class ResumeBase(ResumeProfile):
     raw_text: str
 
 class ResumeCreate(ResumeBase):
@@ -17,17 +19,29 @@ class ResumeCreate(ResumeBase):
 class ResumeResponse(ResumeBase):
     id: int
     filename: str
+    canonical_id: Optional[int] = None # Earlier resume of the same candidate, if this one is a duplicate
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class ResumeListItem(ResumeProfile):
+    """Resume without raw_text, so listing never loads or decompresses the full text."""
+    id: int
+    filename: str
+    canonical_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class JobDescriptionBase(BaseModel):
     title: str = Field(..., example="Senior Python Developer")
     description: str = Field(..., example="Developing and maintaining web applications...")
     required_skills: List[str] = Field(..., example=["Python", "FastAPI", "PostgreSQL"])
     required_experience: float = Field(..., example=5.0)
     required_education: Optional[str] = Field(None, example="Bachelor's Degree")
+    is_open: bool = Field(True, example=True)
 
 class JobDescriptionCreate(JobDescriptionBase):
     pass
@@ -63,4 +77,47 @@ class BulkMatchRequest(BaseModel):
     job_description_id: int = Field(..., example=1)
 
 class BulkMatchResponse(BaseModel):
-    results: List[MatchResponse]
\ No newline at end of file
+    results: List[MatchResponse]
+
+class ResumeSearchResult(BaseModel):
+    id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    experience: Optional[float] = None
+    skills: List[str] = []
+    score: float = Field(..., example=7.42)
+    snippet: str = Field(..., example="...built <mark>Kubernetes</mark> operators in Go...")
+
+class JobStatusUpdate(BaseModel):
+    is_open: bool
+
+class JobMatchResponse(BaseModel):
+    job_description: JobDescriptionResponse
+    rule_based_score: float = Field(..., example=0.72)
+    match_score: float = Field(..., example=7.8)
+    escalated: bool = Field(..., description="Whether the pair cleared the threshold and was scored by the LLM")
+    summary: str
+    strengths: List[str] = []
+    gaps: List[str] = []
+
+class ResumeJobMatchesResponse(BaseModel):
+    resume_id: int
+    results: List[JobMatchResponse]
+
+class CandidateRanking(BaseModel):
+    resume_id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    skill_score: float
+    exp_score: float
+    rule_based_score: float = Field(..., example=0.81)
+
+class AnalyzeResumeResponse(MatchResultBase):
+    id: Optional[int] = Field(None, description="Saved match result id; null unless persist=true")
+    resume_id: Optional[int] = None
+    candidate_name: str = Field(..., example="Jane Doe")
+    experience: float = Field(..., example=5.5)
+    required_skills: List[str] = Field(..., example=["python", "sql", "aws"])
+    skills_matched: List[str] = Field(..., example=["python", "sql"])
+    skills_missing: List[str] = Field(..., example=["aws"])
+    rule_based_score: float = Field(..., example=0.74)
\ No newline at end of file
@@ -0,0 +1,236 @@
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Resume
+
+logger = logging.getLogger(__name__)
+
+QUERY_TERM = re.compile(r'(-?)"([^"]+)"|(-?)(\S+)')
+SNIPPET_OPEN, SNIPPET_CLOSE = "<mark>", "</mark>"
+SNIPPET_WORDS = 24
+# FTS5 "content=''": the index keeps no copy of the (compressed) resume text, snippets are built from resumes.raw_text
+SQLITE_TABLE_SQL = ("CREATE VIRTUAL TABLE resume_search USING fts5(name, skills, body, content='',"
+                    " tokenize = 'porter unicode61')")
+
+
+def _fts5_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _query_terms(query: str) -> Tuple[List[Tuple[str, bool]], List[Tuple[str, bool]]]:
+    """Splits user input into (term, is_prefix) lists of wanted and excluded words or phrases."""
+    positive, negative = [], []
+    for neg_phrase, phrase, neg_word, word in QUERY_TERM.findall(query or ""):
+        if phrase:
+            (negative if neg_phrase else positive).append((phrase, False))
+            continue
+        prefix = word.endswith("*")
+        word = word.rstrip("*").strip('"')
+        if word:
+            (negative if neg_word else positive).append((word, prefix))
+    return positive, negative
+
+
+def build_fts5_query(query: str) -> Optional[str]:
+    """
+    Translates user input into a safe FTS5 expression: words and "quoted phrases" are ANDed,
+    a trailing * makes a prefix query, and a leading - excludes the term.
+    """
+    positive, negative = [
+        [_fts5_phrase(term) + ("*" if prefix else "") for term, prefix in terms] for terms in _query_terms(query)
+    ]
+    if not positive:
+        return None
+    expression = " AND ".join(positive)
+    for term in negative:
+        expression = f"({expression}) NOT {term}"
+    return expression
+
+
+def make_snippet(body: str, query: str) -> str:
+    """
+    About SNIPPET_WORDS words of body around the first hit of the query's terms, with the hits
+    highlighted; the first 200 characters when nothing matches literally (e.g. a stemmed match).
+    """
+    flat = " ".join(body.split())
+    positive, _ = _query_terms(query)
+    if not positive:
+        return flat[:200]
+    pattern = re.compile(
+        r"\b(?:" + "|".join(r"\s+".join(map(re.escape, term.split())) for term, _ in positive) + r")\w*", re.IGNORECASE
+    )
+    match = pattern.search(flat)
+    if match is None:
+        return flat[:200]
+    words = flat.split(" ")
+    first = max(0, flat.count(" ", 0, match.start()) - SNIPPET_WORDS // 4)
+    window = pattern.sub(lambda m: SNIPPET_OPEN + m.group(0) + SNIPPET_CLOSE, " ".join(words[first:first + SNIPPET_WORDS]))
+    return ("…" if first else "") + window + ("…" if first + SNIPPET_WORDS < len(words) else "")
+
+
+class ResumeSearchIndex:
+    """
+    Full-text index over resumes, kept in its own table and written in the same transaction
+    as the resume it describes. SQLite uses a contentless FTS5 virtual table ranked by BM25 (name
+    and skills weighted above body text); PostgreSQL uses a weighted tsvector with a GIN index.
+    Neither stores the resume text a second time: snippets for a page of hits are cut from the
+    decompressed raw_text of just those resumes.
+    """
+
+    def __init__(self, dialect_name: str):
+        self.dialect = dialect_name
+
+    @property
+    def supported(self) -> bool:
+        return self.dialect in ("sqlite", "postgresql")
+
+    def create(self, engine):
+        """Creates the index structures and backfills resumes that are not indexed yet."""
+        with engine.begin() as conn:
+            if self.dialect == "sqlite":
+                existing = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'resume_search'")).scalar()
+                if existing is not None and existing != SQLITE_TABLE_SQL:
+                    logger.info("Rebuilding the full-text index without its copy of the resume text.")
+                    conn.execute(text("DROP TABLE resume_search"))
+                    existing = None
+                if existing is None:
+                    conn.execute(text(SQLITE_TABLE_SQL))
+                    # Persist the column weights so ORDER BY rank uses FTS5's optimized top-k path
+                    conn.execute(text("INSERT INTO resume_search(resume_search, rank) VALUES ('rank', 'bm25(5.0, 3.0, 1.0)')"))
+            elif self.dialect == "postgresql":
+                conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS resume_search ("
+                    " resume_id INTEGER PRIMARY KEY,"
+                    " document TSVECTOR NOT NULL)"
+                ))
+                conn.execute(text("ALTER TABLE resume_search DROP COLUMN IF EXISTS body"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_resume_search_document ON resume_search USING GIN (document)"))
+            else:
+                logger.warning(f"Full-text search is not supported on '{self.dialect}'.")
+                return
+            self._backfill(conn)
+
+    def _backfill(self, conn):
+        # Anti-join, so only unindexed resumes have their raw_text read and decompressed
+        key = "rowid" if self.dialect == "sqlite" else "resume_id"
+        indexed = table("resume_search", column(key))
+        missing = conn.execute(
+            select(Resume.id, Resume.name, Resume.skills, Resume.raw_text).where(Resume.id.not_in(select(indexed.c[key])))
+        ).all()
+        for row in missing:
+            conn.execute(self._insert_statement(), self._params(row.id, row.name, row.skills, row.raw_text))
+        if missing:
+            logger.info(f"Indexed {len(missing)} existing resumes for full-text search.")
+
+    def _insert_statement(self):
+        if self.dialect == "sqlite":
+            return text("INSERT INTO resume_search(rowid, name, skills, body) VALUES (:id, :name, :skills, :body)")
+        return text(
+            "INSERT INTO resume_search (resume_id, document) VALUES (:id,"
+            " setweight(to_tsvector('english', :name), 'A') ||"
+            " setweight(to_tsvector('english', :skills), 'B') ||"
+            " setweight(to_tsvector('english', :body), 'C'))"
+        )
+
+    @staticmethod
+    def _params(resume_id: int, name: Optional[str], skills: Optional[List[str]], body: Optional[str]) -> Dict:
+        return {"id": resume_id, "name": name or "", "skills": " ; ".join(skills or []), "body": body or ""}
+
+    async def index_resume(self, db: AsyncSession, resume: Resume):
+        """Adds a freshly flushed resume to the index; commits with the caller's transaction."""
+        if not self.supported:
+            return
+        await db.execute(self._insert_statement(), self._params(resume.id, resume.name, resume.skills, resume.raw_text))
+
+    async def clear(self, db: AsyncSession):
+        if self.dialect == "sqlite":
+            await db.execute(text("INSERT INTO resume_search(resume_search) VALUES ('delete-all')"))
+        elif self.dialect == "postgresql":
+            await db.execute(text("DELETE FROM resume_search"))
+
+    async def search(self, db: AsyncSession, query: str, skills: List[str], min_experience: Optional[float],
+                     max_experience: Optional[float], limit: int, offset: int) -> List[Dict]:
+        if self.dialect == "sqlite":
+            hits = await self._search_sqlite(db, query, skills, min_experience, max_experience, limit, offset)
+        elif self.dialect == "postgresql":
+            hits = await self._search_postgres(db, query, skills, min_experience, max_experience, limit, offset)
+        else:
+            raise NotImplementedError(f"Full-text search is not supported on '{self.dialect}'.")
+        if not hits:
+            return []
+        # Only the requested page of hits has its raw_text read and decompressed
+        bodies = dict((await db.execute(select(Resume.id, Resume.raw_text).where(Resume.id.in_([h.id for h in hits])))).all())
+        return [self._result(hit, make_snippet(bodies.get(hit.id) or "", query)) for hit in hits]
+
+    @staticmethod
+    def _experience_filters(min_experience: Optional[float], max_experience: Optional[float], params: Dict) -> str:
+        clauses = ""
+        if min_experience is not None:
+            clauses += " AND r.experience >= :min_experience"
+            params["min_experience"] = min_experience
+        if max_experience is not None:
+            clauses += " AND r.experience <= :max_experience"
+            params["max_experience"] = max_experience
+        return clauses
+
+    async def _search_sqlite(self, db, query, skills, min_experience, max_experience, limit, offset) -> List:
+        expression = build_fts5_query(query)
+        if expression is None and not skills:
+            return []
+        params = {"limit": limit, "offset": offset}
+        filters = self._experience_filters(min_experience, max_experience, params)
+        # Skills are matched exactly against resumes.skills, like the jsonb containment on PostgreSQL
+        # (the FTS tokenizer would reduce "c++" and "c#" to the same token)
+        for i, skill in enumerate(skills):
+            filters += f" AND EXISTS (SELECT 1 FROM json_each(r.skills) WHERE value = :skill_{i})"
+            params[f"skill_{i}"] = skill.lower()
+        if expression is None:
+            match, rank, order = "TRUE", "0.0", "r.id"
+        else:
+            params["match"] = expression
+            match, rank = "resume_search MATCH :match", "-f.rank"  # bm25() is lower-is-better; flip the sign
+            order = "f.rank"  # Plain ORDER BY rank keeps FTS5's top-k path
+        return (await db.execute(text(
+            f"SELECT r.id, r.name, r.email, r.experience, r.skills, {rank} AS score"
+            " FROM resume_search AS f JOIN resumes AS r ON r.id = f.rowid"
+            f" WHERE {match}{filters}"
+            f" ORDER BY {order} LIMIT :limit OFFSET :offset"
+        ), params)).all()
+
+    async def _search_postgres(self, db, query, skills, min_experience, max_experience, limit, offset) -> List:
+        params = {"limit": limit, "offset": offset}
+        filters = self._experience_filters(min_experience, max_experience, params)
+        if skills:
+            filters += " AND CAST(r.skills AS jsonb) @> CAST(:skills AS jsonb)"
+            params["skills"] = json.dumps([skill.lower() for skill in skills])
+        if query and query.strip():
+            params["query"] = query
+            matched = ", websearch_to_tsquery('english', :query) AS q"
+            where, rank, order = "s.document @@ q", "ts_rank_cd(s.document, q)", "score DESC"
+        else:
+            matched, where, rank, order = "", "TRUE", "0.0", "r.id"
+        return (await db.execute(text(
+            f"SELECT r.id, r.name, r.email, r.experience, r.skills, {rank} AS score"
+            f" FROM resume_search AS s JOIN resumes AS r ON r.id = s.resume_id{matched}"
+            f" WHERE {where}{filters} ORDER BY {order} LIMIT :limit OFFSET :offset"
+        ), params)).all()
+
+    @staticmethod
+    def _result(row, snippet: str) -> Dict:
+        skills = row.skills
+        if isinstance(skills, str):
+            skills = json.loads(skills)
+        return {
+            "id": row.id,
+            "name": row.name,
+            "email": row.email,
+            "experience": row.experience,
+            "skills": skills or [],
+            "score": round(float(row.score), 6),
+            "snippet": snippet,
+        }
\ No newline at end of file
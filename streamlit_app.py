@@ -16,6 +16,7 @@ if page == "Analyze Resume":
     
     job_description = st.text_area("Job Description", height=200, placeholder="Paste the job description here...")
     resume_file = st.file_uploader("Upload Resume (PDF)", type=['pdf'])
+    persist = st.checkbox("Save resume and result to the database", value=False)
 
     if st.button("Analyze Resume") and resume_file and job_description:
         with st.spinner("Analyzing resume with AI..."):
@@ -25,7 +26,8 @@ if page == "Analyze Resume":
                 }
                 
                 data = {
-                    "description": job_description
+                    "description": job_description,
+                    "persist": str(persist).lower()
                 }
                 
                 response = requests.post(
@@ -38,7 +40,10 @@ if page == "Analyze Resume":
                 if response.status_code == 200:
                     result = response.json()
                     st.success(f"✅ Analysis Complete! Match Score: {result['match_score']}/10")
-                    st.info(f"📊 Analysis ID: {result['id']} | Saved to database")
+                    if result['id'] is not None:
+                        st.info(f"📊 Analysis ID: {result['id']} | Saved to database")
+                    else:
+                        st.info("📊 Not saved (quick screen)")
                     
                     col1, col2 = st.columns(2)
                     
@@ -52,8 +57,8 @@ if page == "Analyze Resume":
                         for skill in result['skills_missing']:
                             st.write(f"- {skill}")
                     
-                    st.subheader("📝 Justification:")
-                    st.write(result['justification'])
+                    st.subheader("📝 Summary:")
+                    st.write(result['summary'])
                     
                 else:
                     st.error(f"Error {response.status_code}: {response.text}")
@@ -119,7 +124,40 @@ elif page == "View History":
 elif page == "Candidate Search":
     st.header("🔍 Search Candidates")
     
-    st.info("This feature would allow searching through all analyzed resumes. Additional endpoints needed for full search functionality.")
+    query = st.text_input("Search", placeholder='e.g. kubernetes "machine learning" -intern')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        skills_filter = st.text_input("Required skills (comma-separated)", placeholder="python, aws")
+    with col2:
+        min_experience = st.number_input("Min experience (years)", min_value=0.0, value=0.0, step=0.5)
+    with col3:
+        limit = st.number_input("Results", min_value=1, max_value=200, value=20)
+
+    if st.button("Search"):
+        params = {"limit": int(limit)}
+        if query:
+            params["q"] = query
+        if min_experience > 0:
+            params["min_experience"] = min_experience
+        skills = [s.strip() for s in skills_filter.split(",") if s.strip()]
+        if skills:
+            params["skills"] = skills
+
+        try:
+            response = requests.get("http://localhost:8000/resumes/search", params=params, timeout=30)
+            if response.status_code == 200:
+                hits = response.json()
+                if hits:
+                    for hit in hits:
+                        st.markdown(f"**{hit['name']}** · {hit['experience']} yrs · {', '.join(hit['skills'])}")
+                        st.markdown(hit["snippet"].replace("\n", " ").replace("<mark>", "**").replace("</mark>", "**"))
+                        st.caption(f"Resume #{hit['id']} | Relevance {hit['score']:.3f}")
+                else:
+                    st.info("No candidates matched your search.")
+            else:
+                st.error(f"Error {response.status_code}: {response.text}")
+        except Exception as e:
+            st.error(f"Connection error: {str(e)}")
 
 # Footer
 st.sidebar.markdown("---")
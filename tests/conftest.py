@@ -0,0 +1,16 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# The repository directory is itself the application package (modules use relative imports)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+PACKAGE = os.getenv("SCREENER_PACKAGE", os.path.basename(ROOT))
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """Imports a module of the application package, e.g. app_module("prompt_builder")."""
+    return lambda name: importlib.import_module(f"{PACKAGE}.{name}")
\ No newline at end of file
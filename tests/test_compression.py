@@ -0,0 +1,85 @@
+import json
+import sqlite3
+
+import pytest
+
+TEXT = ("Senior backend engineer with eight years of Python, PostgreSQL and AWS experience. "
+        "Led the migration of a monolith to services and mentored four engineers. ") * 3
+
+
+@pytest.fixture(scope="module")
+def compression(app_module):
+    return app_module("compression")
+
+
+@pytest.fixture
+def codec(compression):
+    return compression.StorageCodec()
+
+
+def test_round_trip_zstd(compression, codec):
+    if compression.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    stored = codec.compress(TEXT.encode())
+    assert stored[:2] == bytes((compression.MAGIC, compression.CODEC_ZSTD)) and len(stored) < len(TEXT)
+    assert codec.decompress(stored) == TEXT
+
+
+def test_round_trip_with_dictionary(compression, codec):
+    if compression.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    samples = [f"{TEXT} Candidate {i} also knows {skill}.".encode()
+               for i in range(300) for skill in ("Docker", "Kubernetes", "React")]
+    data = compression.train_dictionary(samples, 4096)
+    assert data
+    codec.set_dictionaries({7: data})
+    stored = codec.compress(TEXT.encode())
+    assert stored[:6] == bytes((compression.MAGIC, compression.CODEC_ZSTD_DICT)) + (7).to_bytes(4, "big")
+    assert codec.decompress(stored) == TEXT
+    # A reader that has not loaded dictionary 7 yet fetches it through the loader
+    reader = compression.StorageCodec()
+    reader.set_dictionaries({}, loader=lambda: {7: data})
+    assert reader.decompress(stored) == TEXT
+
+
+def test_round_trip_zlib_without_zstandard(compression, monkeypatch):
+    monkeypatch.setattr(compression, "zstandard", None)
+    codec = compression.StorageCodec()
+    stored = codec.compress(TEXT.encode())
+    assert stored[:2] == bytes((compression.MAGIC, compression.CODEC_ZLIB))
+    assert codec.decompress(stored) == TEXT
+
+
+def test_short_values_stay_plain(codec):
+    assert codec.compress(b"python") == b"python"
+    assert codec.decompress(b"python") == "python"
+
+
+@pytest.mark.parametrize("legacy", [TEXT, TEXT.encode(), memoryview(TEXT.encode()), "", b""])
+def test_legacy_values_read_back_unchanged(codec, legacy):
+    expected = legacy if isinstance(legacy, str) else bytes(legacy).decode()
+    assert codec.decompress(legacy) == expected
+
+
+def test_compressed_json_reads_legacy_json_text(compression):
+    column = compression.CompressedJSON()
+    value = {"strengths": ["Python"], "gaps": []}
+    assert column.process_result_value(json.dumps(value), None) == value
+    assert column.process_result_value(column.process_bind_param(value, None), None) == value
+
+
+def test_stale_clause_selects_only_values_to_rewrite(compression, codec):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, value BLOB)")
+    rows = {
+        1: TEXT,                                  # legacy TEXT
+        2: codec.compress(TEXT.encode()),         # current format
+        3: b"python",                             # short plain bytes
+        4: TEXT.encode(),                         # long plain bytes
+        5: None,
+        6: bytes((compression.MAGIC, 99)) + b"x",  # written with another codec
+    }
+    conn.executemany("INSERT INTO t VALUES (?, ?)", rows.items())
+    clause = codec.stale_clause("value", "sqlite")
+    stale = {row[0] for row in conn.execute(f"SELECT id FROM t WHERE {clause}", codec.stale_params())}
+    assert stale == {1, 4, 6}
\ No newline at end of file
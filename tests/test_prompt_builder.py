@@ -0,0 +1,38 @@
+import pytest
+
+RESUME = """Sameer Khan
+sameer.khan@email.com
+8877665544
+github.com/sameerkhan
+EXPERIENCE
+2018 - Present Senior Backend Engineer, DataCorp
+Built Python and PostgreSQL services handling 2M requests a day.
+2015 - 2018 Software Engineer, LogiSys
+EDUCATION
+2011 - 2015 B.Tech Computer Science"""
+
+
+@pytest.fixture
+def prompt_builder(app_module):
+    return app_module("prompt_builder")
+
+
+@pytest.mark.parametrize("line", [
+    "sameer.khan@email.com", "8877665544", "+91 98765 43210", "(555) 123-4567", "github.com/sameerkhan",
+])
+def test_contact_lines_are_detected(prompt_builder, line):
+    assert prompt_builder.is_contact_line(line)
+
+
+@pytest.mark.parametrize("line", [
+    "2015 - 2018 Software Engineer, LogiSys", "2019 – Present Data Analyst", "2011-2015 B.Tech Computer Science",
+])
+def test_employment_date_ranges_are_not_phone_numbers(prompt_builder, line):
+    assert not prompt_builder.is_contact_line(line)
+
+
+def test_digest_keeps_employment_lines_and_drops_contacts(prompt_builder):
+    digest = prompt_builder.PromptBuilder(digest_budget=400).build_digest(RESUME, {}, ["python"]).split("\n")
+    assert "2015 - 2018 Software Engineer, LogiSys" in digest
+    assert "2018 - Present Senior Backend Engineer, DataCorp" in digest
+    assert not {"sameer.khan@email.com", "8877665544", "github.com/sameerkhan"} & set(digest)
\ No newline at end of file
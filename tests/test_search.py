@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def search(app_module):
+    return app_module("search")
+
+
+@pytest.fixture(scope="module")
+def fts(search):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(search.SQLITE_TABLE_SQL)
+    conn.executemany("INSERT INTO resume_search(rowid, name, skills, body) VALUES (?, ?, ?, ?)", [
+        (1, "Anjali Rao", "python ; machine learning", "Machine learning engineer building Python pipelines."),
+        (2, "Rohan Mehta", "java ; sql", "Backend developer, Java and SQL, some Python scripting."),
+        (3, "Priya Shah", "react ; node.js", 'Frontend work in React; wrote "quoted" release notes.'),
+    ])
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("python django", '"python" AND "django"'),
+    ('"machine learning" -java', '("machine learning") NOT "java"'),
+    ("pyth*", '"pyth"*'),
+    ('a"b', '"a""b"'),
+    ("OR NEAR(", '"OR" AND "NEAR("'),
+])
+def test_build_fts5_query(search, query, expected):
+    assert search.build_fts5_query(query) == expected
+
+
+@pytest.mark.parametrize("query", ["", "   ", "-java", "*", '""'])
+def test_build_fts5_query_without_positive_terms(search, query):
+    assert search.build_fts5_query(query) is None
+
+
+@pytest.mark.parametrize("query, ids", [
+    ("python", {1, 2}),
+    ("python -java", {1}),
+    ('"machine learning"', {1}),
+    ("pipe*", {1}),
+    ("developers", {2}),  # porter stemming
+    ('"quoted', {3}),
+    ("AND OR NOT", set()),
+    ("NEAR( ^ : {", set()),
+])
+def test_fts5_queries_run_safely(search, fts, query, ids):
+    expression = search.build_fts5_query(query)
+    rows = fts.execute("SELECT rowid FROM resume_search WHERE resume_search MATCH ?", (expression,)).fetchall()
+    assert {row[0] for row in rows} == ids
+
+def test_make_snippet_highlights_the_first_hit(search):
+    body = " ".join(f"word{i}" for i in range(100)) + "  Built Python   pipelines for machine learning teams."
+    snippet = search.make_snippet(body, 'python "machine learning" -java')
+    assert snippet.startswith("…") and snippet.count(search.SNIPPET_OPEN) == 2
+    assert "<mark>Python</mark> pipelines for <mark>machine learning</mark>" in snippet
+    assert len(snippet.split()) <= search.SNIPPET_WORDS + 1
+
+
+def test_make_snippet_without_a_literal_hit(search):
+    body = "Developer with ten years of backend work. " * 10
+    assert search.make_snippet(body, "developers") == " ".join(body.split())[:200]
+    assert search.make_snippet(body, "") == " ".join(body.split())[:200]
\ No newline at end of file
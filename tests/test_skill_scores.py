@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+# Includes skills that the TF-IDF tokenizer reduces to nothing ("c", "r") or to shared tokens ("c++", "c#")
+SKILLS = [
+    "python", "java", "c", "r", "c++", "c#", "go", "sql", "postgresql", "machine learning", "deep learning",
+    "docker", "kubernetes", "aws", "react", "node.js", "data analysis", "excel", "git", "linux",
+]
+
+
+@pytest.fixture(scope="module")
+def matcher(app_module):
+    return app_module("matching_engine").MatchingEngine()
+
+
+def random_skill_lists(seed: int, count: int):
+    rng = random.Random(seed)
+    lists = [[], ["c"], ["c", "r"], ["c++", "c#"], ["python", "python"]]
+    while len(lists) < count:
+        lists.append(rng.sample(SKILLS, rng.randint(1, 6)))
+    return lists
+
+
+def test_job_matrix_matches_tfidf_cosine(app_module, matcher):
+    job_index = app_module("job_index")
+    jobs = random_skill_lists(1, 20)
+    resumes = random_skill_lists(2, 40)
+    matrix = job_index.JobMatrix([(i, skills, 0.0) for i, skills in enumerate(jobs)])
+    scores = matrix.skill_scores(resumes)
+    expected = np.array([[matcher.calculate_skill_score(r, j) for j in jobs] for r in resumes])
+    np.testing.assert_allclose(scores, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_feature_store_matches_tfidf_cosine(app_module, matcher):
+    feature_store = app_module("feature_store")
+    store = feature_store.CandidateFeatureStore()
+    resumes = random_skill_lists(3, 50)
+    for resume_id, skills in enumerate(resumes, start=1):
+        store.add(resume_id, skills, 3.0)
+    for job in random_skill_lists(4, 15):
+        ids, _, skill, _, _ = store.score(job, 2.0)
+        expected = [matcher.calculate_skill_score(resumes[i - 1], job) for i in ids]
+        np.testing.assert_allclose(skill, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_weighted_cosine_handles_empty_sides(app_module):
+    weighted_cosine = app_module("job_index").weighted_cosine
+    scores = weighted_cosine(np.zeros(2), np.array([0.0, 4.0]), np.zeros(2), np.array([1.0, 0.0]), np.zeros(2))
+    assert scores.tolist() == [0.0, 0.0]
\ No newline at end of file